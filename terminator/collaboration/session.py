@@ -7,6 +7,8 @@ import json
 import asyncio
 import logging
 import uuid
+import secrets
+import itertools
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 
 from .operational_transform import (
@@ -34,6 +36,22 @@ from ..utils.performance import (
 
 logger = logging.getLogger(__name__)
 
+# Message IDs only need to be unique within a running server, so a random
+# per-process node prefix plus a monotonic counter replaces a uuid4() per message
+_NODE_ID = secrets.token_hex(4)
+_message_seq = itertools.count()
+
+
+def next_message_id() -> str:
+    """
+    Generate a process-unique message ID
+    
+    Returns:
+        Message ID of the form "<node>-<hex sequence>"
+    """
+    return f"{_NODE_ID}-{next(_message_seq):x}"
+
+
 class CursorPosition:
     """Represents a cursor position in a document"""
     
@@ -145,7 +163,7 @@ class User:
             try:
                 await self.websocket.send(json.dumps(message))
             except Exception as e:
-                logger.error(f"Error sending message to {self.username}: {str(e)}")
+                logger.error("Error sending message to %s: %s", self.username, e)
                 self.active = False
     
     def update_cursor(self, file_path: str, position: CursorPosition) -> None:
@@ -237,7 +255,7 @@ class CollaborationSession:
                 disconnected = []
                 for client_id, user in self.users.items():
                     if user.active and user.is_likely_disconnected():
-                        logger.info(f"User {user.username} appears to be disconnected")
+                        logger.info("User %s appears to be disconnected", user.username)
                         user.active = False
                         disconnected.append(client_id)
                 
@@ -253,7 +271,7 @@ class CollaborationSession:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in heartbeat checker: {str(e)}")
+                logger.error("Error in heartbeat checker: %s", e)
     
     async def add_user(self, client_id: str, username: str, websocket) -> None:
         """
@@ -289,7 +307,7 @@ class CollaborationSession:
             "username": username
         }, exclude=user.websocket)
         
-        logger.info(f"User {username} joined session {self.session_id}")
+        logger.info("User %s joined session %s", username, self.session_id)
     
     async def handle_reconnection(self, client_id: str, websocket) -> None:
         """
@@ -331,7 +349,7 @@ class CollaborationSession:
                 "username": user.username
             }, exclude=user.websocket)
             
-            logger.info(f"User {user.username} reconnected to session {self.session_id}")
+            logger.info("User %s reconnected to session %s", user.username, self.session_id)
             return True
         else:
             return False
@@ -358,7 +376,7 @@ class CollaborationSession:
                 "username": username
             })
             
-            logger.info(f"User {username} left session {self.session_id}")
+            logger.info("User %s left session %s", username, self.session_id)
     
     async def broadcast(self, message: Dict[str, Any], exclude=None) -> None:
         """
@@ -370,7 +388,7 @@ class CollaborationSession:
         """
         # Add message ID for acknowledgment tracking if not present
         if "message_id" not in message:
-            message["message_id"] = str(uuid.uuid4())
+            message["message_id"] = next_message_id()
         
         # Initialize acknowledgment tracking
         message_id = message["message_id"]
@@ -432,7 +450,7 @@ class CollaborationSession:
             file_path: File path
             content: File content
         """
-        logger.info(f"Converting file to chunked format: {file_path}")
+        logger.info("Converting file to chunked format: %s", file_path)
         chunked_doc = self.chunk_manager.get_document(file_path)
         chunked_doc.set_content(content)
         self.chunked_files.add(file_path)
@@ -443,7 +461,7 @@ class CollaborationSession:
                 self.client_known_chunks[client_id] = {}
             self.client_known_chunks[client_id][file_path] = {}
     
-    @TimingProfiler.async_profile
+    @TimingProfiler.async_profile(sample_rate=0.01)
     async def handle_edit(self, client_id: str, data: Dict[str, Any]) -> None:
         """
         Handle an edit operation with conflict resolution
@@ -462,7 +480,7 @@ class CollaborationSession:
             
             # Get the user
             if client_id not in self.users:
-                logger.error(f"Unknown client ID: {client_id}")
+                logger.error("Unknown client ID: %s", client_id)
                 return
                 
             user = self.users[client_id]
@@ -591,7 +609,7 @@ class CollaborationSession:
                 await user.send(ack_message)
             
         except Exception as e:
-            logger.error(f"Error handling edit: {str(e)}", exc_info=True)
+            logger.error("Error handling edit: %s", e, exc_info=True)
             # Send error to client
             error_message = {
                 "type": "error",
@@ -621,7 +639,7 @@ class CollaborationSession:
             
             # Get the user
             if client_id not in self.users:
-                logger.error(f"Unknown client ID: {client_id}")
+                logger.error("Unknown client ID: %s", client_id)
                 return
                 
             user = self.users[client_id]
@@ -640,7 +658,7 @@ class CollaborationSession:
             }, exclude=user.websocket)
             
         except Exception as e:
-            logger.error(f"Error handling cursor update: {str(e)}")
+            logger.error("Error handling cursor update: %s", e)
     
     async def handle_chat_message(self, client_id: str, data: Dict[str, Any]) -> None:
         """
@@ -655,7 +673,7 @@ class CollaborationSession:
             
             # Get the user
             if client_id not in self.users:
-                logger.error(f"Unknown client ID: {client_id}")
+                logger.error("Unknown client ID: %s", client_id)
                 return
                 
             user = self.users[client_id]
@@ -678,7 +696,7 @@ class CollaborationSession:
             })
             
         except Exception as e:
-            logger.error(f"Error handling chat message: {str(e)}")
+            logger.error("Error handling chat message: %s", e)
     
     async def handle_heartbeat(self, client_id: str) -> None:
         """
@@ -796,12 +814,12 @@ class SessionManager:
                 
                 for session_id in to_remove:
                     del self.sessions[session_id]
-                    logger.info(f"Removed empty session: {session_id}")
+                    logger.info("Removed empty session: %s", session_id)
                     
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in session cleanup: {str(e)}")
+                logger.error("Error in session cleanup: %s", e)
                 
     async def _monitor_performance(self) -> None:
         """Periodically monitor and log performance statistics"""
@@ -816,18 +834,20 @@ class SessionManager:
                 if timing_stats:
                     logger.info("Performance statistics:")
                     for func_name, stats in timing_stats.items():
-                        logger.info(f"  {func_name}: avg={stats['avg']:.4f}s, calls={stats['count']}, "
-                                   f"min={stats['min']:.4f}s, max={stats['max']:.4f}s")
+                        # count is estimated from the samples for sampled functions
+                        logger.info("  %s: avg=%.4fs, calls=%d, samples=%d, min=%.4fs, max=%.4fs",
+                                    func_name, stats['avg'], stats['count'], stats['samples'],
+                                    stats['min'], stats['max'])
                 
                 # Log connection pool stats if enabled
                 if self.connection_pool_manager:
                     pool_stats = self.connection_pool_manager.get_stats()
-                    logger.info(f"Connection pool statistics: {pool_stats}")
+                    logger.info("Connection pool statistics: %s", pool_stats)
                     
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in performance monitoring: {str(e)}")
+                logger.error("Error in performance monitoring: %s", e)
     
     @PerformanceOptimizer.memoize(ttl=5)  # Cache for 5 seconds to reduce load
     def get_active_session_count(self) -> int:
@@ -867,7 +887,7 @@ class SessionManager:
         # Start the session
         asyncio.create_task(session.start())
         
-        logger.info(f"Created new session: {session_id} - {name}")
+        logger.info("Created new session: %s - %s", session_id, name)
         return session
     
     def get_session(self, session_id: str) -> Optional[CollaborationSession]:
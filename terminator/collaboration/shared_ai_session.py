@@ -7,7 +7,7 @@ import logging
 import uuid
 from typing import Dict, List, Any, Optional, Set, Callable, Awaitable
 
-from .session import SessionManager
+from .session import SessionManager, next_message_id
 from ..utils.performance import (
     PerformanceOptimizer,
     TimingProfiler
@@ -18,6 +18,8 @@ logger = logging.getLogger(__name__)
 class AIMessage:
     """Represents a message in the AI conversation"""
     
+    __slots__ = ("message_id", "content", "role", "user_id", "username", "timestamp")
+    
     def __init__(self, 
                  message_id: str,
                  content: str,
@@ -76,6 +78,11 @@ class AIMessage:
 class SharedAIContext:
     """Manages shared context for an AI assistant session"""
     
+    __slots__ = (
+        "context_id", "created_at", "messages", "max_history", "max_token_limit",
+        "current_token_count", "last_updated", "is_generating", "active_users"
+    )
+    
     def __init__(self, 
                  context_id: str,
                  system_prompt: str = "You are a helpful AI coding assistant.",
@@ -123,7 +130,7 @@ class SharedAIContext:
         Returns:
             The created message
         """
-        message_id = str(uuid.uuid4())
+        message_id = next_message_id()
         message = AIMessage(
             message_id=message_id,
             content=content,
@@ -218,10 +225,16 @@ class SharedAIContext:
 class SharedAIManager:
     """Manages shared AI contexts and integrates with collaboration sessions"""
     
+    __slots__ = (
+        "contexts", "session_to_context", "session_to_context_obj",
+        "ai_client", "generate_callback"
+    )
+    
     def __init__(self):
         """Initialize a shared AI manager"""
         self.contexts: Dict[str, SharedAIContext] = {}
         self.session_to_context: Dict[str, str] = {}  # session_id -> context_id
+        self.session_to_context_obj: Dict[str, SharedAIContext] = {}  # session_id -> context
         self.ai_client: Optional[Any] = None
         self.generate_callback: Optional[Callable[[str, List[Dict[str, str]]], Awaitable[str]]] = None
     
@@ -254,6 +267,10 @@ class SharedAIManager:
             system_prompt=system_prompt
         )
         self.contexts[context_id] = context
+        # Repoint sessions already linked to this ID at the new context
+        for session_id, linked_id in self.session_to_context.items():
+            if linked_id == context_id:
+                self.session_to_context_obj[session_id] = context
         return context
     
     def get_context(self, context_id: str) -> Optional[SharedAIContext]:
@@ -277,6 +294,11 @@ class SharedAIManager:
             context_id: AI context ID
         """
         self.session_to_context[session_id] = context_id
+        context = self.contexts.get(context_id)
+        if context:
+            self.session_to_context_obj[session_id] = context
+        else:
+            self.session_to_context_obj.pop(session_id, None)
     
     def get_context_for_session(self, session_id: str) -> Optional[SharedAIContext]:
         """
@@ -288,10 +310,15 @@ class SharedAIManager:
         Returns:
             The AI context or None if not found
         """
-        context_id = self.session_to_context.get(session_id)
-        if context_id:
-            return self.get_context(context_id)
-        return None
+        context = self.session_to_context_obj.get(session_id)
+        if context is None:
+            # The session may have been linked before its context existed
+            context_id = self.session_to_context.get(session_id)
+            if context_id is not None:
+                context = self.contexts.get(context_id)
+                if context is not None:
+                    self.session_to_context_obj[session_id] = context
+        return context
     
     def register_ai_client(self, client: Any) -> None:
         """
@@ -324,11 +351,11 @@ class SharedAIManager:
         """
         context = self.get_context(context_id)
         if not context:
-            logger.error(f"Context not found: {context_id}")
+            logger.error("Context not found: %s", context_id)
             return None
         
         if context.is_generating:
-            logger.warning(f"Already generating a response for context: {context_id}")
+            logger.warning("Already generating a response for context: %s", context_id)
             return None
         
         try:
@@ -353,7 +380,7 @@ class SharedAIManager:
             return message
             
         except Exception as e:
-            logger.error(f"Error generating response: {str(e)}", exc_info=True)
+            logger.error("Error generating response: %s", e, exc_info=True)
             return None
         finally:
             context.is_generating = False
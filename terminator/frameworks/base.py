@@ -3,14 +3,203 @@ Base Framework Module - Provides base classes for framework-specific tooling
 """
 
 import os
+import re
+import json
+import codecs
+import signal
+import asyncio
 import logging
+import functools
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Iterator, Sequence, Set, Tuple
 
-from textual.app import App
+from textual.app import App, ComposeResult
+from textual.containers import Container, ScrollableContainer
+from textual.widgets import Button, Label, RichLog, Static
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # json.loads accepts UTF-8 bytes too
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Button ID prefix for framework command buttons in the toolbar
+_FRAMEWORK_CMD_PREFIX = "framework-command-"
+_FRAMEWORK_CMD_PREFIX_LEN = len(_FRAMEWORK_CMD_PREFIX)
+
+# Per-line buffer limit for subprocess output streams; the asyncio default
+# (64 KiB) raises on the long lines some commands print
+SUBPROCESS_STREAM_LIMIT = 4 * 1024 * 1024
+
+# Read size for forwarding long-running process output
+_STREAM_CHUNK_SIZE = 65536
+
+# Seconds a terminated command gets to exit before it is killed
+_TERMINATE_GRACE = 2.0
+
+# Lines of command output kept per stream for the returned result
+_OUTPUT_TAIL_LINES = 10000
+
+# Directory levels below the workspace root searched for an application file
+_APP_SEARCH_DEPTH = 3
+
+# Directories that never decide which framework a project uses but can hold
+# thousands of source files (dependencies, caches, build output)
+SKIP_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv", "env", "site-packages",
+    "dist", "build", ".tox", ".mypy_cache", ".pytest_cache"
+})
+
+# Imports live at the top of a file, so detectors only read this many bytes
+_HEAD_BYTES = 8192
+
+# File reads release the GIL, so import scanning of larger workspaces is
+# spread over a thread pool; small workspaces are scanned inline
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_PARALLEL_SCAN_THRESHOLD = 64
+_SCAN_BATCH_SIZE = 256
+
+# One pass over each file head finds the imports of every detectable framework;
+# the name of the matching group identifies the framework
+_IMPORT_PATTERN = re.compile(
+    rb"(?P<flask>from flask import|import flask)"
+    rb"|(?P<fastapi>from fastapi import|import fastapi)"
+    rb"|(?P<react>import React|from 'react'|from \"react\")"
+)
+
+
+@functools.lru_cache(maxsize=128)
+def read_package_json(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a package.json, shared by every provider that reads one
+    
+    Keyed by modification time, so an edited file is parsed again while
+    unchanged files are parsed once per process. The returned dict is
+    shared between callers and must not be modified.
+    
+    Args:
+        path: Path to package.json
+        mtime_ns: st_mtime_ns of the file, used only as part of the cache key
+        
+    Returns:
+        The parsed package.json
+    """
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+@functools.lru_cache(maxsize=128)
+def _read_lower_text(path: str, mtime_ns: int) -> str:
+    """
+    Read and lowercase a text file, cached per modification time
+    
+    Args:
+        path: Path of the file to read
+        mtime_ns: st_mtime_ns of the file, used only as part of the cache key
+        
+    Returns:
+        Lowercased file contents
+    """
+    with open(path, "r") as f:
+        return f.read().lower()
+
+
+def search_app_file(workspace_path: str, candidates: Sequence[str]) -> Optional[str]:
+    """
+    Breadth-first search of a workspace for an application file
+    
+    The root is read first, so a root-level file costs a single scandir.
+    Hidden and dependency/cache directories are skipped and the search
+    stops _APP_SEARCH_DEPTH levels below the root. Kept at module level
+    so it can run in an executor without capturing a provider.
+    
+    Args:
+        workspace_path: Root path of the project workspace
+        candidates: Application file names in order of preference
+        
+    Returns:
+        Path to the shallowest matching file, or None
+    """
+    pending = deque([(workspace_path, 0)])
+    while pending:
+        current, depth = pending.popleft()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+                
+        file_names = set()
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if (depth < _APP_SEARCH_DEPTH and not entry.name.startswith(".")
+                        and entry.name not in SKIP_DIRS):
+                    pending.append((entry.path, depth + 1))
+            else:
+                file_names.add(entry.name)
+                    
+        for file_name in candidates:
+            if file_name in file_names:
+                return os.path.join(current, file_name)
+                    
+    return None
+
+
+def _walk_files(path: str) -> Iterator[os.DirEntry]:
+    """
+    Yield file entries below a directory using os.scandir
+    
+    DirEntry caches its type information, so this avoids the extra stat
+    calls made by os.walk. Directory symlinks are not followed and
+    directories in SKIP_DIRS are not descended into.
+    
+    Args:
+        path: Directory to walk
+        
+    Yields:
+        Directory entries for non-directory files
+    """
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            pending.append(entry.path)
+                    else:
+                        yield entry
+        except OSError as e:
+            logger.error(f"Error scanning {current}: {str(e)}")
+
+
+class _OutputTail:
+    """The last lines of a command's output, counting the lines dropped before them"""
+    
+    def __init__(self, max_lines: int):
+        self._lines: deque = deque(maxlen=max_lines)
+        self._omitted = 0
+        
+    def add(self, text: str) -> None:
+        """Add a batch of output lines, dropping the oldest past the limit"""
+        lines = text.splitlines(keepends=True)
+        self._omitted += max(0, len(self._lines) + len(lines) - self._lines.maxlen)
+        self._lines.extend(lines)
+        
+    def text(self) -> str:
+        """Get the kept output, led by a marker line if earlier lines were dropped"""
+        text = "".join(self._lines)
+        if self._omitted:
+            return f"… {self._omitted} earlier lines omitted\n{text}"
+        return text
+
+
 class FrameworkDetector:
     """
     Detects which frameworks are used in a project
@@ -19,6 +208,13 @@ class FrameworkDetector:
     which frameworks are being used.
     """
     
+    # Manifests whose modification times invalidate cached detection results
+    _MANIFEST_FILES = ("requirements.txt", "pyproject.toml", "package.json")
+    
+    # Manifest-decided results shared across instances:
+    # workspace_path -> (manifest signature, framework -> used)
+    _results_cache: Dict[str, Tuple[Tuple[Optional[int], ...], Dict[str, bool]]] = {}
+    
     def __init__(self, workspace_path: str):
         """
         Initialize the framework detector
@@ -27,6 +223,45 @@ class FrameworkDetector:
             workspace_path: Root path of the project workspace
         """
         self.workspace_path = workspace_path
+        # Lazily built index of workspace source files, shared by all detectors
+        self._file_index: Optional[Dict[str, Any]] = None
+        # Lowercased requirements.txt + pyproject.toml contents, read once
+        self._deps_text: Optional[str] = None
+        # Frameworks whose imports were found while scanning source files
+        self._import_hits: Optional[Set[str]] = None
+        
+    def _scan_workspace(self) -> Dict[str, Any]:
+        """
+        Walk the workspace once and index the files the detectors care about
+        
+        Returns:
+            Dictionary with keys:
+            - py_files: Paths of Python files
+            - js_ts_files: Paths of .js/.ts files
+            - has_jsx_tsx: Whether any .jsx/.tsx file exists
+        """
+        if self._file_index is not None:
+            return self._file_index
+            
+        py_files: List[str] = []
+        js_ts_files: List[str] = []
+        has_jsx_tsx = False
+        
+        for entry in _walk_files(self.workspace_path):
+            name = entry.name
+            if name.endswith(".py"):
+                py_files.append(entry.path)
+            elif name.endswith(".js") or name.endswith(".ts"):
+                js_ts_files.append(entry.path)
+            elif name.endswith(".jsx") or name.endswith(".tsx"):
+                has_jsx_tsx = True
+                    
+        self._file_index = {
+            "py_files": py_files,
+            "js_ts_files": js_ts_files,
+            "has_jsx_tsx": has_jsx_tsx
+        }
+        return self._file_index
         
     def detect_frameworks(self) -> Dict[str, bool]:
         """
@@ -35,237 +270,231 @@ class FrameworkDetector:
         Returns:
             Dictionary mapping framework names to booleans indicating if they're used
         """
-        results = {
-            "django": self._detect_django(),
-            "flask": self._detect_flask(),
-            "fastapi": self._detect_fastapi(),
-            "react": self._detect_react()
+        # What the dependency manifests decide is reused across detectors until
+        # one of them changes. The file-based heuristics depend on the whole
+        # tree, so they are never cached and always run for undecided frameworks
+        signature = self._manifest_signature()
+        cached = FrameworkDetector._results_cache.get(self.workspace_path)
+        if cached and cached[0] == signature:
+            decided = cached[1]
+        else:
+            decided = self._manifest_results()
+            FrameworkDetector._results_cache[self.workspace_path] = (signature, decided)
+            
+        return {
+            "django": decided.get("django") or self._detect_django(),
+            "flask": decided.get("flask") or self._detect_flask(),
+            "fastapi": decided.get("fastapi") or self._detect_fastapi(),
+            "react": decided.get("react") or self._detect_react()
         }
+    
+    def _manifest_results(self) -> Dict[str, bool]:
+        """
+        Detect the frameworks the dependency manifests alone decide
+        
+        A framework is decided only when a manifest lists it. Workspace roots and
+        libraries often leave React out of the root package.json, so a missing
+        entry falls back to the source heuristics like the Python frameworks do.
+        
+        Returns:
+            Dictionary mapping decided framework names to whether they're used
+        """
+        deps_text = self._get_dependency_text()
+        decided = {name: True for name in ("django", "flask", "fastapi") if name in deps_text}
+        
+        if self._package_json_has_react():
+            decided["react"] = True
+        return decided
+    
+    def _manifest_signature(self) -> Tuple[Optional[int], ...]:
+        """
+        Get the modification times of the workspace's dependency manifests
+        
+        Returns:
+            Tuple of st_mtime_ns values (None for missing files)
+        """
+        signature = []
+        for filename in self._MANIFEST_FILES:
+            try:
+                signature.append(os.stat(os.path.join(self.workspace_path, filename)).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
+    async def detect_frameworks_async(self) -> Dict[str, bool]:
+        """
+        Detect which frameworks are used without blocking the event loop
+        
+        The workspace walk and file reads run in a worker thread, so this
+        is safe to await from Textual handlers.
+        
+        Returns:
+            Dictionary mapping framework names to booleans indicating if they're used
+        """
+        return await asyncio.to_thread(self.detect_frameworks)
+    
+    def _get_dependency_text(self) -> str:
+        """
+        Get the lowercased contents of requirements.txt and pyproject.toml
+        
+        Returns:
+            Combined dependency file contents (empty if neither file exists)
+        """
+        if self._deps_text is not None:
+            return self._deps_text
+            
+        contents = []
+        for filename in ("requirements.txt", "pyproject.toml"):
+            content = self._read_text(os.path.join(self.workspace_path, filename))
+            if content:
+                contents.append(content)
+                    
+        self._deps_text = "\n".join(contents)
+        return self._deps_text
+    
+    def _read_text(self, file_path: str) -> Optional[str]:
+        """
+        Read and lowercase a small project file, reusing it while unchanged
         
-        return results
+        Args:
+            file_path: Path of the file to read
+            
+        Returns:
+            Lowercased file contents, or None if the file is missing or unreadable
+        """
+        try:
+            return _read_lower_text(file_path, os.stat(file_path).st_mtime_ns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
+            return None
     
     def _detect_django(self) -> bool:
         """Check if Django is used in the project"""
-        # Look for Django-specific files
-        django_markers = [
-            os.path.join(self.workspace_path, "manage.py"),
-            os.path.join(self.workspace_path, "settings.py"),
-            os.path.join(self.workspace_path, "*", "settings.py")
-        ]
-        
-        # Check if any markers exist
-        for marker in django_markers:
-            if "*" in marker:
-                # Handle wildcard pattern
-                base_dir = os.path.dirname(marker.replace("*", ""))
-                if os.path.exists(base_dir):
-                    for item in os.listdir(base_dir):
-                        item_path = os.path.join(base_dir, item)
-                        if os.path.isdir(item_path):
-                            settings_path = os.path.join(item_path, "settings.py")
-                            if os.path.exists(settings_path):
-                                return True
-            else:
-                if os.path.exists(marker):
-                    return True
-                    
-        # Check requirements.txt or pyproject.toml
-        requirements_path = os.path.join(self.workspace_path, "requirements.txt")
-        if os.path.exists(requirements_path):
-            try:
-                with open(requirements_path, "r") as f:
-                    content = f.read()
-                    if "django" in content.lower():
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading requirements.txt: {str(e)}", exc_info=True)
+        # Look for Django-specific files at the workspace root
+        for marker in ("manage.py", "settings.py"):
+            if os.path.exists(os.path.join(self.workspace_path, marker)):
+                return True
                 
-        pyproject_path = os.path.join(self.workspace_path, "pyproject.toml")
-        if os.path.exists(pyproject_path):
-            try:
-                with open(pyproject_path, "r") as f:
-                    content = f.read()
-                    if "django" in content.lower():
+        # Look for a project package one level down (<package>/settings.py)
+        try:
+            with os.scandir(self.workspace_path) as it:
+                for entry in it:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "settings.py")):
                         return True
-            except Exception as e:
-                logger.error(f"Error reading pyproject.toml: {str(e)}", exc_info=True)
-                
+        except OSError as e:
+            logger.error(f"Error scanning {self.workspace_path}: {str(e)}")
+
         return False
     
     def _detect_flask(self) -> bool:
         """Check if Flask is used in the project"""
-        # Look for Flask app files
-        flask_patterns = [
-            "app.py",
-            "application.py",
-            "wsgi.py",
-            "*.py"  # We'll search for Flask imports
-        ]
-        
-        # Common Flask imports
-        flask_imports = [
-            "from flask import",
-            "import flask"
-        ]
-        
-        # Check for Flask imports in Python files
-        for pattern in flask_patterns:
-            if pattern == "*.py":
-                for root, _, files in os.walk(self.workspace_path):
-                    for file in files:
-                        if file.endswith(".py"):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, "r") as f:
-                                    content = f.read()
-                                    for import_stmt in flask_imports:
-                                        if import_stmt in content:
-                                            return True
-                            except Exception as e:
-                                logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
-            else:
-                file_path = os.path.join(self.workspace_path, pattern)
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, "r") as f:
-                            content = f.read()
-                            for import_stmt in flask_imports:
-                                if import_stmt in content:
-                                    return True
-                    except Exception as e:
-                        logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
-                        
-        # Check requirements.txt or pyproject.toml
-        requirements_path = os.path.join(self.workspace_path, "requirements.txt")
-        if os.path.exists(requirements_path):
-            try:
-                with open(requirements_path, "r") as f:
-                    content = f.read()
-                    if "flask" in content.lower():
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading requirements.txt: {str(e)}", exc_info=True)
-                
-        pyproject_path = os.path.join(self.workspace_path, "pyproject.toml")
-        if os.path.exists(pyproject_path):
-            try:
-                with open(pyproject_path, "r") as f:
-                    content = f.read()
-                    if "flask" in content.lower():
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading pyproject.toml: {str(e)}", exc_info=True)
-                
-        return False
+        return "flask" in self._scan_imports()
     
     def _detect_fastapi(self) -> bool:
         """Check if FastAPI is used in the project"""
-        # Look for FastAPI app files
-        fastapi_patterns = [
-            "app.py",
-            "main.py",
-            "api.py",
-            "*.py"  # We'll search for FastAPI imports
-        ]
-        
-        # Common FastAPI imports
-        fastapi_imports = [
-            "from fastapi import",
-            "import fastapi"
-        ]
-        
-        # Check for FastAPI imports in Python files
-        for pattern in fastapi_patterns:
-            if pattern == "*.py":
-                for root, _, files in os.walk(self.workspace_path):
-                    for file in files:
-                        if file.endswith(".py"):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, "r") as f:
-                                    content = f.read()
-                                    for import_stmt in fastapi_imports:
-                                        if import_stmt in content:
-                                            return True
-                            except Exception as e:
-                                logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
-            else:
-                file_path = os.path.join(self.workspace_path, pattern)
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, "r") as f:
-                            content = f.read()
-                            for import_stmt in fastapi_imports:
-                                if import_stmt in content:
-                                    return True
-                    except Exception as e:
-                        logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
-                        
-        # Check requirements.txt or pyproject.toml
-        requirements_path = os.path.join(self.workspace_path, "requirements.txt")
-        if os.path.exists(requirements_path):
-            try:
-                with open(requirements_path, "r") as f:
-                    content = f.read()
-                    if "fastapi" in content.lower():
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading requirements.txt: {str(e)}", exc_info=True)
-                
-        pyproject_path = os.path.join(self.workspace_path, "pyproject.toml")
-        if os.path.exists(pyproject_path):
-            try:
-                with open(pyproject_path, "r") as f:
-                    content = f.read()
-                    if "fastapi" in content.lower():
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading pyproject.toml: {str(e)}", exc_info=True)
-                
-        return False
+        return "fastapi" in self._scan_imports()
     
     def _detect_react(self) -> bool:
-        """Check if React is used in the project"""
-        # Look for React-specific files
-        react_markers = [
-            os.path.join(self.workspace_path, "package.json"),
-            os.path.join(self.workspace_path, "node_modules", "react"),
-            os.path.join(self.workspace_path, "src", "App.js"),
-            os.path.join(self.workspace_path, "src", "index.js"),
-            os.path.join(self.workspace_path, "public", "index.html")
-        ]
-        
-        # Check if package.json contains React
-        package_json_path = os.path.join(self.workspace_path, "package.json")
-        if os.path.exists(package_json_path):
-            try:
-                with open(package_json_path, "r") as f:
-                    content = f.read().lower()
-                    if "\"react\"" in content:
-                        return True
-            except Exception as e:
-                logger.error(f"Error reading package.json: {str(e)}", exc_info=True)
-        
+        """Check the sources for React; used when package.json does not list it"""
         # Check for JSX files
-        for root, _, files in os.walk(self.workspace_path):
-            for file in files:
-                if file.endswith(".jsx") or file.endswith(".tsx"):
-                    return True
+        if self._scan_workspace()["has_jsx_tsx"]:
+            return True
                     
         # Look for React imports in JS files
-        for root, _, files in os.walk(self.workspace_path):
-            for file in files:
-                if file.endswith(".js") or file.endswith(".ts"):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, "r") as f:
-                            content = f.read()
-                            if "import React" in content or "from 'react'" in content or 'from "react"' in content:
-                                return True
-                    except Exception as e:
-                        logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
+        return "react" in self._scan_imports()
+    
+    def _scan_imports(self) -> Set[str]:
+        """
+        Scan source file heads once for framework imports
+        
+        Python files are checked for Flask and FastAPI imports, JS/TS files
+        for React imports.
+        
+        Returns:
+            Set of framework names whose imports were found
+        """
+        if self._import_hits is not None:
+            return self._import_hits
+            
+        file_index = self._scan_workspace()
+        found: Set[str] = set()
+        
+        for file_paths, frameworks in (
+            (file_index["py_files"], {"flask", "fastapi"}),
+            (file_index["js_ts_files"], {"react"})
+        ):
+            executor = None
+            if len(file_paths) >= _PARALLEL_SCAN_THRESHOLD:
+                executor = ThreadPoolExecutor(max_workers=_SCAN_WORKERS)
+                
+            try:
+                # Scan in batches so we can stop as soon as every framework
+                # this file type can reveal has been found
+                for start in range(0, len(file_paths), _SCAN_BATCH_SIZE):
+                    batch = file_paths[start:start + _SCAN_BATCH_SIZE]
+                    if executor:
+                        heads = executor.map(self._read_head, batch)
+                    else:
+                        heads = map(self._read_head, batch)
                         
-        return False
+                    for head in heads:
+                        for match in _IMPORT_PATTERN.finditer(head):
+                            if match.lastgroup in frameworks:
+                                found.add(match.lastgroup)
+                                
+                    if frameworks <= found:
+                        break
+            finally:
+                if executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                        
+        self._import_hits = found
+        return found
+    
+    def _package_json_has_react(self) -> bool:
+        """
+        Check whether package.json lists React as a dependency
+        
+        Only the dependency sections count; "react" can also appear in
+        eslintConfig, keywords and similar fields.
+        
+        Returns:
+            Whether React is a dependency (False if there is no readable package.json)
+        """
+        file_path = os.path.join(self.workspace_path, "package.json")
+        try:
+            package_data = read_package_json(file_path, os.stat(file_path).st_mtime_ns)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
+            return False
+            
+        if not isinstance(package_data, dict):
+            return False
+        return any(
+            isinstance(package_data.get(section), dict) and "react" in package_data[section]
+            for section in ("dependencies", "devDependencies", "peerDependencies")
+        )
+    
+    def _read_head(self, file_path: str) -> bytes:
+        """
+        Read the start of a file
+        
+        Args:
+            file_path: Path of the file to read
+            
+        Returns:
+            Up to _HEAD_BYTES bytes (empty if the file could not be read)
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(_HEAD_BYTES)
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {str(e)}", exc_info=True)
+            return b""
 
 
 class FrameworkProvider(ABC):
@@ -343,34 +572,162 @@ class FrameworkProvider(ABC):
         """
         self.output_callback = callback
     
-    async def _run_shell_command(self, command: List[str]) -> str:
+    async def _run_shell_command(self,
+                                 command: List[str],
+                                 output_callback: Optional[Callable[[str], None]] = None,
+                                 cwd: Optional[str] = None,
+                                 env: Optional[Dict[str, str]] = None) -> str:
         """
         Run a shell command and return its output
         
+        The command runs in its own session, so cancellation (including by an
+        enclosing asyncio.timeout) or a failing callback stops any children it
+        started as well. Only the last
+        _OUTPUT_TAIL_LINES lines of each stream are kept, after a line saying
+        how many earlier lines were omitted.
+        
         Args:
             command: Command to run as a list of arguments
+            output_callback: Optional function called with each batch of complete
+                lines as they are produced; stderr is merged into stdout in this mode
+            cwd: Working directory for the command (defaults to the workspace root)
+            env: Environment for the command (defaults to the current one)
             
         Returns:
-            Command output
+            stdout on success, otherwise an error message with stderr
         """
         try:
             process = await asyncio.create_subprocess_exec(
                 *command,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self.workspace_path
+                stderr=asyncio.subprocess.STDOUT if output_callback else asyncio.subprocess.PIPE,
+                cwd=cwd or self.workspace_path,
+                env=env,
+                limit=SUBPROCESS_STREAM_LIMIT,
+                start_new_session=True
             )
             
-            stdout, stderr = await process.communicate()
+            try:
+                stdout, stderr = await self._collect_output(process, output_callback)
+            finally:
+                # Cancelled or the callback raised: don't leave it running
+                await self._terminate_process(process)
             
             if process.returncode == 0:
-                return stdout.decode("utf-8")
+                return stdout
             else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                return f"Error ({process.returncode}):\n{stderr if stderr is not None else stdout}"
                 
         except Exception as e:
             logger.error(f"Error running command {command}: {str(e)}", exc_info=True)
             return f"Error: {str(e)}"
+    
+    async def _collect_output(
+        self,
+        process: asyncio.subprocess.Process,
+        output_callback: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Read a process's output until it exits, keeping the tail of each stream
+        
+        Args:
+            process: Process started with piped stdout (and optionally stderr)
+            output_callback: Optional function also called with the output as it arrives
+            
+        Returns:
+            The kept stdout and stderr (None if stderr was not piped separately)
+        """
+        def collector(tail: _OutputTail) -> Callable[[str], None]:
+            def collect(text: str) -> None:
+                tail.add(text)
+                if output_callback:
+                    output_callback(text)
+            return collect
+            
+        stdout_tail = _OutputTail(_OUTPUT_TAIL_LINES)
+        stderr_tail = _OutputTail(_OUTPUT_TAIL_LINES)
+        assert process.stdout is not None
+        readers = [self._forward_stream(process.stdout, collector(stdout_tail))]
+        if process.stderr:
+            readers.append(self._forward_stream(process.stderr, collector(stderr_tail)))
+        await asyncio.gather(*readers)
+        await process.wait()
+        return stdout_tail.text(), stderr_tail.text() if process.stderr else None
+    
+    async def _terminate_process(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Stop a command started in its own session, along with its children
+        
+        Sends SIGTERM to the process group and escalates to SIGKILL if it has
+        not exited after _TERMINATE_GRACE seconds.
+        
+        Args:
+            process: Process started with start_new_session=True
+        """
+        if process.returncode is not None:
+            return
+            
+        def send(sig: int) -> None:
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(process.pid, sig)
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
+                
+        send(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), _TERMINATE_GRACE)
+        except TimeoutError:
+            send(getattr(signal, "SIGKILL", signal.SIGTERM))
+            await process.wait()
+    
+    async def _forward_stream(self,
+                              stream: asyncio.StreamReader,
+                              output_callback: Callable[[str], None],
+                              chunk_size: int = _STREAM_CHUNK_SIZE,
+                              split_cr: bool = False) -> None:
+        """
+        Forward a subprocess output stream to a callback until EOF
+        
+        Output is read in fixed-size chunks and decoded with an incremental
+        UTF-8 decoder, so multi-byte characters split across reads are
+        handled. The callback only ever receives complete lines.
+        
+        Args:
+            stream: Subprocess stdout or stderr reader
+            output_callback: Function called with each batch of complete lines
+            chunk_size: Maximum number of bytes per read
+            split_cr: Also treat a carriage return as a line end, so progress
+                output that rewrites a single line is forwarded as it changes
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        after_cr = False
+        
+        while True:
+            chunk = await stream.read(chunk_size)
+            text = pending + decoder.decode(chunk, final=not chunk)
+            
+            if after_cr and text.startswith("\n"):
+                # The "\n" of a "\r\n" split across reads; the line was already sent
+                text = text[1:]
+            
+            if not chunk:
+                if text:
+                    output_callback(text)
+                break
+                
+            cut = text.rfind("\n")
+            if split_cr:
+                cut = max(cut, text.rfind("\r"))
+            if cut >= 0:
+                output_callback(text[:cut + 1])
+                after_cr = text[cut] == "\r"
+                pending = text[cut + 1:]
+            else:
+                pending = text
 
 
 class FrameworkToolbar(Container):
@@ -426,7 +783,9 @@ class FrameworkToolbar(Container):
         """
         super().__init__(id="framework-panel")
         self.provider = provider
-        self.provider.set_output_callback(self._update_output)
+        self.provider.set_output_callback(self._append_output)
+        # Whether the running command has streamed output into the log
+        self._streamed = False
     
     def compose(self) -> ComposeResult:
         """Create the toolbar layout"""
@@ -434,22 +793,27 @@ class FrameworkToolbar(Container):
         yield Label(f"{self.provider.framework_icon} {self.provider.framework_name}", id="framework-title")
         
         # Framework commands
-        commands_container = Container(id="framework-commands")
-        for command in self.provider.framework_commands:
-            commands_container.mount(Button(
-                command["label"],
-                id=f"framework-command-{command['id']}",
-                classes="framework-command-button"
-            ))
-        yield commands_container
+        yield Container(
+            *(
+                Button(
+                    command["label"],
+                    id=f"{_FRAMEWORK_CMD_PREFIX}{command['id']}",
+                    classes="framework-command-button"
+                )
+                for command in self.provider.framework_commands
+            ),
+            id="framework-commands"
+        )
         
         # Framework info
         yield Label("Project Info:", classes="info-title")
-        yield ScrollableContainer(id="framework-info")
+        yield ScrollableContainer(
+            Static(markup=False, id="framework-info-text"), id="framework-info"
+        )
         
         # Command output
         yield Label("Output:", classes="output-title")
-        yield ScrollableContainer(id="framework-output")
+        yield RichLog(max_lines=5000, wrap=False, id="framework-output")
     
     async def on_mount(self) -> None:
         """Called when the widget is mounted"""
@@ -460,13 +824,11 @@ class FrameworkToolbar(Container):
         """Handle button presses"""
         button_id = event.button.id
         
-        if button_id.startswith("framework-command-"):
-            command_id = button_id[len("framework-command-"):]
+        if button_id and button_id.startswith(_FRAMEWORK_CMD_PREFIX):
+            command_id = button_id[_FRAMEWORK_CMD_PREFIX_LEN:]
             
             # Clear output
-            output_container = self.query_one("#framework-output")
-            output_container.remove_children()
-            output_container.mount(Label("Running command..."))
+            self._update_output("Running command...")
             
             # Run the command
             asyncio.create_task(self._run_command(command_id))
@@ -478,41 +840,43 @@ class FrameworkToolbar(Container):
             info = await self.provider.get_project_info()
             
             # Display info
-            info_container = self.query_one("#framework-info")
-            info_container.remove_children()
-            
-            for key, value in info.items():
-                info_container.mount(Label(f"{key}: {value}"))
+            info_text = self.query_one("#framework-info-text", Static)
+            info_text.update("\n".join(f"{key}: {value}" for key, value in info.items()))
                 
         except Exception as e:
             logger.error(f"Error loading project info: {str(e)}", exc_info=True)
             
-            info_container = self.query_one("#framework-info")
-            info_container.remove_children()
-            info_container.mount(Label(f"Error: {str(e)}"))
+            info_text = self.query_one("#framework-info-text", Static)
+            info_text.update(f"Error: {str(e)}")
     
     async def _run_command(self, command_id: str) -> None:
         """Run a framework command"""
+        self._streamed = False
         try:
             # Run the command
             output = await self.provider.run_command(command_id)
-            
-            # Update output
-            self._update_output(output)
-                
         except Exception as e:
             logger.error(f"Error running command: {str(e)}", exc_info=True)
+            output = f"Error: {str(e)}"
             
-            output_container = self.query_one("#framework-output")
-            output_container.remove_children()
-            output_container.mount(Label(f"Error: {str(e)}"))
+        if self._streamed:
+            # The log already holds the output, so only add how the command
+            # ended; errors and one-line results are status lines themselves
+            text = output.strip()
+            status = ""
+            if text.startswith("Error") or "\n" not in text:
+                status = text.partition("\n")[0]
+            self.query_one("#framework-output", RichLog).write(status or "Command finished")
+        else:
+            self._update_output(output)
     
     def _update_output(self, output: str) -> None:
-        """Update the output container with command output"""
-        output_container = self.query_one("#framework-output")
-        output_container.remove_children()
-        
-        # Split output into lines and create labels
-        lines = output.splitlines()
-        for line in lines:
-            output_container.mount(Label(line))
+        """Replace the output log contents with command output"""
+        output_log = self.query_one("#framework-output", RichLog)
+        output_log.clear()
+        output_log.write(output)
+    
+    def _append_output(self, output: str) -> None:
+        """Append streamed command output to the output log"""
+        self._streamed = True
+        self.query_one("#framework-output", RichLog).write(output.rstrip("\n"))
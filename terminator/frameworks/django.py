@@ -4,15 +4,87 @@ Django Framework Module - Provides Django-specific tooling
 
 import os
 import sys
+import json
 import logging
 import asyncio
 import subprocess
 from typing import Dict, List, Any, Optional, Set, Tuple, Callable
 
-from .base import FrameworkProvider
+from textual.app import App
+
+from .base import FrameworkProvider, SKIP_DIRS, SUBPROCESS_STREAM_LIMIT
 
 logger = logging.getLogger(__name__)
 
+# Command definitions shown in the framework toolbar; built once at import
+_DJANGO_COMMANDS: List[Dict[str, Any]] = [
+    {
+        "id": "runserver",
+        "label": "Run Server",
+        "description": "Start the Django development server",
+        "action": "run_server"
+    },
+    {
+        "id": "makemigrations",
+        "label": "Make Migrations",
+        "description": "Create database migrations",
+        "action": "make_migrations"
+    },
+    {
+        "id": "migrate",
+        "label": "Migrate",
+        "description": "Apply database migrations",
+        "action": "migrate"
+    },
+    {
+        "id": "shell",
+        "label": "Django Shell",
+        "description": "Run the Django shell",
+        "action": "shell"
+    },
+    {
+        "id": "createsuperuser",
+        "label": "Create Superuser",
+        "description": "Create a Django admin superuser",
+        "action": "create_superuser"
+    },
+    {
+        "id": "collectstatic",
+        "label": "Collect Static",
+        "description": "Collect static files",
+        "action": "collect_static"
+    },
+    {
+        "id": "test",
+        "label": "Run Tests",
+        "description": "Run Django tests",
+        "action": "run_tests"
+    },
+    {
+        "id": "startapp",
+        "label": "Start App",
+        "description": "Create a new Django app",
+        "action": "start_app"
+    }
+]
+
+# Collects Django project details in a single subprocess; settings are
+# optional so the version is still reported when setup fails
+_PROJECT_INFO_SCRIPT = """
+import json, os
+import django
+info = {"version": django.get_version()}
+try:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+    from django.conf import settings
+    info["apps"] = list(settings.INSTALLED_APPS)
+    info["engine"] = settings.DATABASES.get("default", {}).get("ENGINE", "unknown")
+except Exception:
+    pass
+print(json.dumps(info))
+"""
+
 class DjangoFrameworkProvider(FrameworkProvider):
     """
     Provides Django-specific tooling for Terminator IDE
@@ -21,6 +93,52 @@ class DjangoFrameworkProvider(FrameworkProvider):
     and code generation capabilities.
     """
     
+    # Command ID -> handler method name, resolved once per call with getattr
+    _COMMAND_MAP: Dict[str, str] = {
+        "runserver": "_run_server",
+        "makemigrations": "_make_migrations",
+        "migrate": "_migrate",
+        "shell": "_shell",
+        "createsuperuser": "_create_superuser",
+        "collectstatic": "_collect_static",
+        "test": "_run_tests",
+        "startapp": "_start_app"
+    }
+    
+    def __init__(self, workspace_path: str, app: Optional[App] = None):
+        """
+        Initialize the Django framework provider
+        
+        Args:
+            workspace_path: Root path of the project workspace
+            app: Terminator app instance (optional)
+        """
+        super().__init__(workspace_path, app)
+        self._manage_py_path: Optional[str] = None
+    
+    def _find_manage_py(self) -> Optional[str]:
+        """
+        Locate manage.py, walking the workspace only on the first lookup
+        
+        Returns:
+            Path to manage.py, or None if the project has none
+        """
+        if self._manage_py_path and os.path.exists(self._manage_py_path):
+            return self._manage_py_path
+            
+        manage_py_path = os.path.join(self.workspace_path, "manage.py")
+        if not os.path.exists(manage_py_path):
+            # Try to find it in subdirectories
+            manage_py_path = None
+            for root, dirs, files in os.walk(self.workspace_path):
+                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+                if "manage.py" in files:
+                    manage_py_path = os.path.join(root, "manage.py")
+                    break
+                    
+        self._manage_py_path = manage_py_path
+        return manage_py_path
+    
     @property
     def framework_name(self) -> str:
         """Get the name of the framework"""
@@ -34,56 +152,7 @@ class DjangoFrameworkProvider(FrameworkProvider):
     @property
     def framework_commands(self) -> List[Dict[str, Any]]:
         """Get Django-specific commands"""
-        return [
-            {
-                "id": "runserver",
-                "label": "Run Server",
-                "description": "Start the Django development server",
-                "action": "run_server"
-            },
-            {
-                "id": "makemigrations",
-                "label": "Make Migrations",
-                "description": "Create database migrations",
-                "action": "make_migrations"
-            },
-            {
-                "id": "migrate",
-                "label": "Migrate",
-                "description": "Apply database migrations",
-                "action": "migrate"
-            },
-            {
-                "id": "shell",
-                "label": "Django Shell",
-                "description": "Run the Django shell",
-                "action": "shell"
-            },
-            {
-                "id": "createsuperuser",
-                "label": "Create Superuser",
-                "description": "Create a Django admin superuser",
-                "action": "create_superuser"
-            },
-            {
-                "id": "collectstatic",
-                "label": "Collect Static",
-                "description": "Collect static files",
-                "action": "collect_static"
-            },
-            {
-                "id": "test",
-                "label": "Run Tests",
-                "description": "Run Django tests",
-                "action": "run_tests"
-            },
-            {
-                "id": "startapp",
-                "label": "Start App",
-                "description": "Create a new Django app",
-                "action": "start_app"
-            }
-        ]
+        return _DJANGO_COMMANDS
     
     async def get_project_info(self) -> Dict[str, Any]:
         """Get Django project information"""
@@ -91,42 +160,30 @@ class DjangoFrameworkProvider(FrameworkProvider):
         
         try:
             # Find manage.py
-            manage_py_path = os.path.join(self.workspace_path, "manage.py")
-            if not os.path.exists(manage_py_path):
-                # Try to find it in subdirectories
-                for root, _, files in os.walk(self.workspace_path):
-                    if "manage.py" in files:
-                        manage_py_path = os.path.join(root, "manage.py")
-                        break
+            manage_py_path = self._find_manage_py()
             
-            if os.path.exists(manage_py_path):
+            if manage_py_path:
                 info["Manage.py Path"] = os.path.relpath(manage_py_path, self.workspace_path)
                 
-                # Get Django version
-                version_output = await self._run_shell_command(
-                    [sys.executable, manage_py_path, "version"]
+                # Get version, installed apps and database engine in one interpreter
+                # so Python start-up and django.setup() are only paid once
+                info_output = await self._run_shell_command(
+                    [sys.executable, "-c", _PROJECT_INFO_SCRIPT]
                 )
-                if version_output.strip():
-                    info["Django Version"] = version_output.strip()
+                try:
+                    project_info = json.loads(info_output)
+                except ValueError:
+                    project_info = {}
                     
-                # Get installed apps
-                apps_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import os, django; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings'); django.setup(); from django.conf import settings; print('\\n'.join(settings.INSTALLED_APPS))"
-                ])
-                
-                if apps_output.strip():
-                    app_list = apps_output.strip().split('\n')
+                if project_info.get("version"):
+                    info["Django Version"] = project_info["version"]
+                    
+                app_list = project_info.get("apps")
+                if app_list:
                     info["Installed Apps"] = f"{len(app_list)} apps"
                     
-                # Get database info
-                db_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import os, django, json; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings'); django.setup(); from django.conf import settings; db = settings.DATABASES.get('default', {}); print(db.get('ENGINE', 'unknown'))"
-                ])
-                
-                if db_output.strip():
-                    db_engine = db_output.strip()
+                db_engine = project_info.get("engine")
+                if db_engine:
                     db_name = "unknown"
                     
                     if "sqlite3" in db_engine:
@@ -147,31 +204,15 @@ class DjangoFrameworkProvider(FrameworkProvider):
     async def run_command(self, command_id: str) -> str:
         """Run a Django-specific command"""
         # Find manage.py
-        manage_py_path = os.path.join(self.workspace_path, "manage.py")
-        if not os.path.exists(manage_py_path):
-            # Try to find it in subdirectories
-            for root, _, files in os.walk(self.workspace_path):
-                if "manage.py" in files:
-                    manage_py_path = os.path.join(root, "manage.py")
-                    break
+        manage_py_path = self._find_manage_py()
         
-        if not os.path.exists(manage_py_path):
+        if not manage_py_path:
             return "Error: manage.py not found in the project"
             
         # Call the appropriate method based on command_id
-        command_map = {
-            "runserver": self._run_server,
-            "makemigrations": self._make_migrations,
-            "migrate": self._migrate,
-            "shell": self._shell,
-            "createsuperuser": self._create_superuser,
-            "collectstatic": self._collect_static,
-            "test": self._run_tests,
-            "startapp": self._start_app
-        }
-        
-        if command_id in command_map:
-            return await command_map[command_id](manage_py_path)
+        method_name = self._COMMAND_MAP.get(command_id)
+        if method_name:
+            return await getattr(self, method_name)(manage_py_path)
         else:
             return f"Error: Unknown command '{command_id}'"
     
@@ -186,8 +227,11 @@ class DjangoFrameworkProvider(FrameworkProvider):
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self.workspace_path
+                # runserver logs requests and reloads to stderr; merging it keeps
+                # that output visible and stops an undrained pipe stalling the server
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=self.workspace_path,
+                limit=SUBPROCESS_STREAM_LIMIT
             )
             
             # Initial message
@@ -195,16 +239,9 @@ class DjangoFrameworkProvider(FrameworkProvider):
             if self.output_callback:
                 self.output_callback(initial_output)
                 
-            # Read stdout incrementally
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_str = line.decode("utf-8")
-                if self.output_callback:
-                    self.output_callback(initial_output + line_str)
-                    initial_output = ""  # Only include it once
+            # Read the combined output incrementally
+            assert process.stdout is not None
+            await self._forward_stream(process.stdout, self.output_callback)
             
             return "Django server stopped"
         else:
@@ -215,13 +252,13 @@ class DjangoFrameworkProvider(FrameworkProvider):
         """Create database migrations"""
         return await self._run_shell_command([
             sys.executable, manage_py_path, "makemigrations"
-        ])
+        ], self.output_callback)
     
     async def _migrate(self, manage_py_path: str) -> str:
         """Apply database migrations"""
         return await self._run_shell_command([
             sys.executable, manage_py_path, "migrate"
-        ])
+        ], self.output_callback)
     
     async def _shell(self, manage_py_path: str) -> str:
         """Run the Django shell"""
@@ -237,13 +274,13 @@ class DjangoFrameworkProvider(FrameworkProvider):
         """Collect static files"""
         return await self._run_shell_command([
             sys.executable, manage_py_path, "collectstatic", "--noinput"
-        ])
+        ], self.output_callback)
     
     async def _run_tests(self, manage_py_path: str) -> str:
         """Run Django tests"""
         return await self._run_shell_command([
             sys.executable, manage_py_path, "test"
-        ])
+        ], self.output_callback)
     
     async def _start_app(self, manage_py_path: str) -> str:
         """Create a new Django app"""
@@ -4,15 +4,113 @@ FastAPI Framework Module - Provides FastAPI-specific tooling
 
 import os
 import sys
+import atexit
+import shutil
+import socket
+import json
+import time
 import logging
 import asyncio
-import subprocess
+import weakref
+import webbrowser
 from typing import Dict, List, Any, Optional, Set, Tuple, Callable
 
-from .base import FrameworkProvider
+from textual.app import App
+
+from .base import FrameworkProvider, SUBPROCESS_STREAM_LIMIT, search_app_file
 
 logger = logging.getLogger(__name__)
 
+# Live providers whose background servers must not outlive the IDE. Held
+# weakly so the single exit hook below does not keep providers alive.
+_PROVIDERS: "weakref.WeakSet[FastAPIFrameworkProvider]" = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_all_providers() -> None:
+    """Stop the background servers of every live provider at interpreter exit"""
+    for provider in list(_PROVIDERS):
+        provider.shutdown_servers()
+
+# Command definitions shown in the framework toolbar; built once at import
+_FASTAPI_COMMANDS: List[Dict[str, Any]] = [
+    {
+        "id": "run",
+        "label": "Run Server",
+        "description": "Start the FastAPI development server",
+        "action": "run_server"
+    },
+    {
+        "id": "docs",
+        "label": "Open Docs",
+        "description": "Open the FastAPI documentation in a browser",
+        "action": "open_docs"
+    },
+    {
+        "id": "redoc",
+        "label": "Open ReDoc",
+        "description": "Open the ReDoc documentation in a browser",
+        "action": "open_redoc"
+    },
+    {
+        "id": "generate-client",
+        "label": "Generate Client",
+        "description": "Generate a TypeScript client",
+        "action": "generate_client"
+    },
+    {
+        "id": "alembic-init",
+        "label": "Init DB",
+        "description": "Initialize Alembic for migrations",
+        "action": "alembic_init"
+    },
+    {
+        "id": "alembic-migrate",
+        "label": "DB Migrate",
+        "description": "Create an Alembic migration",
+        "action": "alembic_migrate"
+    },
+    {
+        "id": "alembic-upgrade",
+        "label": "DB Upgrade",
+        "description": "Apply Alembic migrations",
+        "action": "alembic_upgrade"
+    },
+    {
+        "id": "test",
+        "label": "Run Tests",
+        "description": "Run tests with pytest",
+        "action": "run_tests"
+    }
+]
+
+# Application file names, in order of preference
+_APP_FILE_CANDIDATES = ("main.py", "app.py", "api.py")
+
+# Seconds a get_project_info result is reused before probing again
+_PROJECT_INFO_TTL = 60
+
+# Collects FastAPI project details in a single subprocess and prints them as JSON.
+# Package metadata and find_spec are used so no probed package is imported.
+_PROJECT_INFO_SCRIPT = """
+import json
+from importlib.metadata import PackageNotFoundError, distributions, version
+from importlib.util import find_spec
+info = {}
+try:
+    info["version"] = version("fastapi")
+except PackageNotFoundError:
+    pass
+wanted = {"uvicorn", "pydantic", "starlette", "sqlalchemy", "alembic"}
+info["dependencies"] = sorted({
+    d.metadata["Name"] for d in distributions()
+    if (d.metadata["Name"] or "").lower() in wanted
+})
+info["sqlalchemy"] = find_spec("sqlalchemy") is not None
+info["alembic"] = find_spec("alembic") is not None
+print(json.dumps(info))
+"""
+
 class FastAPIFrameworkProvider(FrameworkProvider):
     """
     Provides FastAPI-specific tooling for Terminator IDE
@@ -21,6 +119,77 @@ class FastAPIFrameworkProvider(FrameworkProvider):
     and code generation capabilities.
     """
     
+    def __init__(self, workspace_path: str, app: Optional[App] = None):
+        """
+        Initialize the FastAPI framework provider
+        
+        Args:
+            workspace_path: Root path of the project workspace
+            app: Terminator app instance (optional)
+        """
+        super().__init__(workspace_path, app)
+        # (app file path, workspace root mtime) from the last discovery
+        self._app_file_cache: Optional[Tuple[str, float]] = None
+        # Last get_project_info result and when it was collected
+        self._project_info_cache: Optional[Dict[str, Any]] = None
+        self._project_info_cache_time: float = 0
+        # Background uvicorn servers shared by docs/redoc/client generation
+        self._uvicorn_procs: Dict[str, Tuple[asyncio.subprocess.Process, int]] = {}
+        # Resolved openapi-generator-cli path, looked up on first use
+        self._openapi_generator_path: Optional[str] = None
+        _PROVIDERS.add(self)
+    
+    def clear_cache(self) -> None:
+        """Forget cached discovery results so the next command rescans the workspace"""
+        self._app_file_cache = None
+        self.invalidate_project_info()
+    
+    def shutdown_servers(self) -> None:
+        """Kill any background uvicorn servers started for docs or client generation"""
+        for process, _ in self._uvicorn_procs.values():
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+        self._uvicorn_procs.clear()
+    
+    def invalidate_project_info(self) -> None:
+        """Force the next get_project_info call to collect fresh information"""
+        self._project_info_cache = None
+    
+    async def _find_app_file(self) -> Optional[str]:
+        """
+        Locate the FastAPI application file (main.py, app.py or api.py)
+        
+        The result is cached until the workspace root's modification time
+        changes or the cached file disappears.
+        
+        Returns:
+            Path to the application file, or None if none was found
+        """
+        # The stat calls and directory walk block, so keep them off the event loop
+        return await asyncio.to_thread(self._locate_app_file)
+    
+    def _locate_app_file(self) -> Optional[str]:
+        """Blocking part of _find_app_file: validate the cache or search the workspace"""
+        try:
+            root_mtime = os.stat(self.workspace_path).st_mtime
+        except OSError:
+            return None
+            
+        if self._app_file_cache:
+            cached_path, cached_mtime = self._app_file_cache
+            if cached_mtime == root_mtime and os.path.exists(cached_path):
+                return cached_path
+                
+        # Shallowest match first; a root-level file costs a single scandir
+        app_file_path = search_app_file(self.workspace_path, _APP_FILE_CANDIDATES)
+                    
+        if app_file_path:
+            self._app_file_cache = (app_file_path, root_mtime)
+        return app_file_path
+    
     @property
     def framework_name(self) -> str:
         """Get the name of the framework"""
@@ -34,149 +203,66 @@ class FastAPIFrameworkProvider(FrameworkProvider):
     @property
     def framework_commands(self) -> List[Dict[str, Any]]:
         """Get FastAPI-specific commands"""
-        return [
-            {
-                "id": "run",
-                "label": "Run Server",
-                "description": "Start the FastAPI development server",
-                "action": "run_server"
-            },
-            {
-                "id": "docs",
-                "label": "Open Docs",
-                "description": "Open the FastAPI documentation in a browser",
-                "action": "open_docs"
-            },
-            {
-                "id": "redoc",
-                "label": "Open ReDoc",
-                "description": "Open the ReDoc documentation in a browser",
-                "action": "open_redoc"
-            },
-            {
-                "id": "generate-client",
-                "label": "Generate Client",
-                "description": "Generate a TypeScript client",
-                "action": "generate_client"
-            },
-            {
-                "id": "alembic-init",
-                "label": "Init DB",
-                "description": "Initialize Alembic for migrations",
-                "action": "alembic_init"
-            },
-            {
-                "id": "alembic-migrate",
-                "label": "DB Migrate",
-                "description": "Create an Alembic migration",
-                "action": "alembic_migrate"
-            },
-            {
-                "id": "alembic-upgrade",
-                "label": "DB Upgrade",
-                "description": "Apply Alembic migrations",
-                "action": "alembic_upgrade"
-            },
-            {
-                "id": "test",
-                "label": "Run Tests",
-                "description": "Run tests with pytest",
-                "action": "run_tests"
-            }
-        ]
+        return _FASTAPI_COMMANDS
     
     async def get_project_info(self) -> Dict[str, Any]:
         """Get FastAPI project information"""
+        # Installed versions don't change within a session, so reuse recent results
+        if (self._project_info_cache is not None
+                and time.monotonic() - self._project_info_cache_time < _PROJECT_INFO_TTL):
+            return dict(self._project_info_cache)
+            
         info = {}
+        # Only a completed probe of a found app file is worth reusing; a missing
+        # file or failed probe is retried on the next call
+        cacheable = False
         
         try:
             # Look for main.py, app.py, or api.py
-            app_files = ["main.py", "app.py", "api.py"]
-            app_file_path = None
-            
-            for file_name in app_files:
-                path = os.path.join(self.workspace_path, file_name)
-                if os.path.exists(path):
-                    app_file_path = path
-                    break
-            
-            if not app_file_path:
-                # Try to find in subdirectories
-                for root, _, files in os.walk(self.workspace_path):
-                    for file_name in app_files:
-                        if file_name in files:
-                            app_file_path = os.path.join(root, file_name)
-                            break
-                    if app_file_path:
-                        break
+            app_file_path = await self._find_app_file()
                         
             if app_file_path:
                 info["App File"] = os.path.relpath(app_file_path, self.workspace_path)
                 
-                # Try to get FastAPI version
-                version_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import fastapi; print(fastapi.__version__)"
-                ])
-                
-                if version_output.strip():
-                    info["FastAPI Version"] = version_output.strip()
+                # Collect version, dependency and database details in one
+                # interpreter instead of one subprocess per probe
+                info_output = await self._run_shell_command(
+                    [sys.executable, "-c", _PROJECT_INFO_SCRIPT]
+                )
+                try:
+                    project_info = json.loads(info_output)
+                    cacheable = True
+                except ValueError:
+                    project_info = {}
                     
-                # Check for common FastAPI dependencies
-                deps_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import pkg_resources; print('\\n'.join([d.project_name for d in pkg_resources.working_set if d.project_name.lower() in ['uvicorn', 'pydantic', 'starlette', 'sqlalchemy', 'alembic']]))"
-                ])
-                
-                if deps_output.strip():
-                    deps = deps_output.strip().split('\n')
-                    info["Dependencies"] = ", ".join(deps)
+                if project_info.get("version"):
+                    info["FastAPI Version"] = project_info["version"]
+                    
+                if project_info.get("dependencies"):
+                    info["Dependencies"] = ", ".join(project_info["dependencies"])
                 
                 # Check for database
-                has_sqlalchemy = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "try: import sqlalchemy; print('Yes'); except ImportError: print('No')"
-                ])
-                
-                if "Yes" in has_sqlalchemy:
+                if project_info.get("sqlalchemy"):
                     info["Database"] = "SQLAlchemy"
                     
                     # Check for Alembic
-                    has_alembic = await self._run_shell_command([
-                        sys.executable, "-c", 
-                        "try: import alembic; print('Yes'); except ImportError: print('No')"
-                    ])
-                    
-                    if "Yes" in has_alembic:
+                    if project_info.get("alembic"):
                         info["Migrations"] = "Alembic"
                 
         except Exception as e:
             logger.error(f"Error getting FastAPI project info: {str(e)}", exc_info=True)
             info["Error"] = str(e)
             
+        if cacheable and "Error" not in info:
+            self._project_info_cache = dict(info)
+            self._project_info_cache_time = time.monotonic()
+            
         return info
     
     async def run_command(self, command_id: str) -> str:
         """Run a FastAPI-specific command"""
         # Look for main.py, app.py, or api.py
-        app_files = ["main.py", "app.py", "api.py"]
-        app_file_path = None
-        
-        for file_name in app_files:
-            path = os.path.join(self.workspace_path, file_name)
-            if os.path.exists(path):
-                app_file_path = path
-                break
-        
-        if not app_file_path:
-            # Try to find in subdirectories
-            for root, _, files in os.walk(self.workspace_path):
-                for file_name in app_files:
-                    if file_name in files:
-                        app_file_path = os.path.join(root, file_name)
-                        break
-                if app_file_path:
-                    break
+        app_file_path = await self._find_app_file()
                     
         if not app_file_path:
             return "Error: Could not find FastAPI application file (main.py, app.py, or api.py)"
@@ -208,25 +294,18 @@ class FastAPIFrameworkProvider(FrameworkProvider):
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
+                # uvicorn logs to stderr; merge it so the pipe is drained
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=os.path.dirname(app_file_path),
+                limit=SUBPROCESS_STREAM_LIMIT
             )
             
             # Initial message
-            initial_output = "Starting FastAPI development server...\n"
-            if self.output_callback:
-                self.output_callback(initial_output)
+            self.output_callback("Starting FastAPI development server...\n")
                 
             # Read stdout incrementally
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_str = line.decode("utf-8")
-                if self.output_callback:
-                    self.output_callback(initial_output + line_str)
-                    initial_output = ""  # Only include it once
+            assert process.stdout is not None
+            await self._forward_stream(process.stdout, self.output_callback)
             
             return "FastAPI server stopped"
         else:
@@ -250,104 +329,143 @@ class FastAPIFrameworkProvider(FrameworkProvider):
                 logger.error(f"Error running FastAPI server: {str(e)}", exc_info=True)
                 return f"Error: {str(e)}"
     
-    async def _open_docs(self, app_file_path: str) -> str:
-        """Open the FastAPI documentation in a browser"""
-        # Start the server first
+    async def _ensure_server(self, app_file_path: str) -> Tuple[asyncio.subprocess.Process, int]:
+        """
+        Return a running background uvicorn server for the app, starting one if needed
+        
+        Args:
+            app_file_path: Path to the FastAPI app file
+            
+        Returns:
+            Tuple of (server process, port)
+        """
+        entry = self._uvicorn_procs.get(app_file_path)
+        if entry is not None and entry[0].returncode is None:
+            return entry
+        
         app_module = os.path.basename(app_file_path).replace(".py", "")
         
-        # Get a free port
-        port = await self._get_free_port()
+        # Bind the listening socket here and hand it to uvicorn, so no other
+        # process can take the port between allocation and startup
+        sock = self._bind_free_socket()
+        port = sock.getsockname()[1]
+        
+        # Start the server in the background. Output is discarded since nothing
+        # drains it and a full pipe would stall the long-lived server.
+        cmd = [sys.executable, "-m", "uvicorn", f"{app_module}:app"]
+        kwargs: Dict[str, Any] = {}
+        if os.name == "nt":
+            # pass_fds is POSIX-only, so release the probed port and pass its number
+            sock.close()
+            cmd.append(f"--port={port}")
+        else:
+            cmd.append(f"--fd={sock.fileno()}")
+            kwargs["pass_fds"] = (sock.fileno(),)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=os.path.dirname(app_file_path),
+                **kwargs
+            )
+        finally:
+            # The child holds its own copy of the descriptor
+            sock.close()
         
-        # Start the server in the background
-        cmd = [sys.executable, "-m", "uvicorn", f"{app_module}:app", f"--port={port}"]
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=os.path.dirname(app_file_path)
-        )
+        # Wait until the server accepts connections
+        try:
+            await self._wait_for_port(port, process=process)
+        except TimeoutError:
+            if process.returncode is None:
+                process.kill()
+                # Reap the killed server so it does not linger as a zombie
+                await process.wait()
+            raise
+        
+        self._uvicorn_procs[app_file_path] = (process, port)
+        return process, port
+    
+    async def _wait_for_port(
+        self,
+        port: int,
+        timeout: float = 10.0,
+        process: Optional[asyncio.subprocess.Process] = None
+    ) -> None:
+        """
+        Wait until a local TCP port accepts connections
+        
+        Args:
+            port: Port to probe on 127.0.0.1
+            timeout: Maximum number of seconds to wait
+            process: Server process; probing stops early if it exits
+            
+        Raises:
+            TimeoutError: If the port is not ready in time or the process exited
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        # Wait a moment for the server to start
-        await asyncio.sleep(2)
+        while True:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                if process is not None and process.returncode is not None:
+                    raise TimeoutError(f"server exited with code {process.returncode}") from None
+                if loop.time() >= deadline:
+                    raise TimeoutError(f"port {port} not ready after {timeout} seconds") from None
+                await asyncio.sleep(0.05)
+            else:
+                writer.close()
+                return
+    
+    async def _open_docs(self, app_file_path: str) -> str:
+        """Open the FastAPI documentation in a browser"""
+        try:
+            _, port = await self._ensure_server(app_file_path)
+        except TimeoutError as e:
+            return f"Error: FastAPI server did not start ({e})"
         
         # Open the docs URL
         docs_url = f"http://localhost:{port}/docs"
         
-        # Use webbrowser module to open the URL
-        await self._run_shell_command([
-            sys.executable, "-c", f"import webbrowser; webbrowser.open('{docs_url}')"
-        ])
-        
-        # Wait for a moment before killing the server
-        await asyncio.sleep(5)
-        process.terminate()
+        # webbrowser.open may spawn a helper, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, webbrowser.open, docs_url)
         
         return f"Opened FastAPI docs at {docs_url}"
     
     async def _open_redoc(self, app_file_path: str) -> str:
         """Open the ReDoc documentation in a browser"""
-        # Start the server first
-        app_module = os.path.basename(app_file_path).replace(".py", "")
-        
-        # Get a free port
-        port = await self._get_free_port()
-        
-        # Start the server in the background
-        cmd = [sys.executable, "-m", "uvicorn", f"{app_module}:app", f"--port={port}"]
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=os.path.dirname(app_file_path)
-        )
-        
-        # Wait a moment for the server to start
-        await asyncio.sleep(2)
+        try:
+            _, port = await self._ensure_server(app_file_path)
+        except TimeoutError as e:
+            return f"Error: FastAPI server did not start ({e})"
         
         # Open the ReDoc URL
         redoc_url = f"http://localhost:{port}/redoc"
         
-        # Use webbrowser module to open the URL
-        await self._run_shell_command([
-            sys.executable, "-c", f"import webbrowser; webbrowser.open('{redoc_url}')"
-        ])
-        
-        # Wait for a moment before killing the server
-        await asyncio.sleep(5)
-        process.terminate()
+        # webbrowser.open may spawn a helper, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, webbrowser.open, redoc_url)
         
         return f"Opened FastAPI ReDoc at {redoc_url}"
     
     async def _generate_client(self, app_file_path: str) -> str:
         """Generate a TypeScript client"""
         # Check if openapi-generator-cli is installed
-        openapi_check = await self._run_shell_command([
-            "which", "openapi-generator-cli"
-        ])
+        if self._openapi_generator_path is None:
+            self._openapi_generator_path = shutil.which("openapi-generator-cli")
         
-        if not openapi_check.strip():
+        if self._openapi_generator_path is None:
             return """Error: openapi-generator-cli not found.
             
 Install it with:
 npm install @openapitools/openapi-generator-cli -g"""
         
-        # Start the server first to get the OpenAPI schema
-        app_module = os.path.basename(app_file_path).replace(".py", "")
-        
-        # Get a free port
-        port = await self._get_free_port()
-        
-        # Start the server in the background
-        cmd = [sys.executable, "-m", "uvicorn", f"{app_module}:app", f"--port={port}"]
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=os.path.dirname(app_file_path)
-        )
-        
-        # Wait a moment for the server to start
-        await asyncio.sleep(2)
+        # Reuse (or start) a server to get the OpenAPI schema
+        try:
+            _, port = await self._ensure_server(app_file_path)
+        except TimeoutError as e:
+            return f"Error: FastAPI server did not start ({e})"
         
         # Get the OpenAPI schema URL
         openapi_url = f"http://localhost:{port}/openapi.json"
@@ -358,116 +476,53 @@ npm install @openapitools/openapi-generator-cli -g"""
         
         # Run the openapi-generator to generate a TypeScript client
         result = await self._run_shell_command([
-            "openapi-generator-cli", "generate",
+            self._openapi_generator_path, "generate",
             "-i", openapi_url,
             "-g", "typescript-fetch",
             "-o", os.path.join(clients_dir, "typescript-client")
         ])
         
-        # Kill the server
-        process.terminate()
-        
         return f"TypeScript client generated in ./clients/typescript-client\n\n{result}"
     
     async def _alembic_init(self, app_file_path: str) -> str:
         """Initialize Alembic for migrations"""
-        cmd = [sys.executable, "-m", "alembic", "init", "migrations"]
-        
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error initializing Alembic: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        return await self._run_shell_command(
+            [sys.executable, "-m", "alembic", "init", "migrations"],
+            cwd=os.path.dirname(app_file_path)
+        )
     
     async def _alembic_migrate(self, app_file_path: str) -> str:
         """Create an Alembic migration"""
-        cmd = [sys.executable, "-m", "alembic", "revision", "--autogenerate", "-m", "Auto migration"]
-        
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error creating Alembic migration: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        return await self._run_shell_command(
+            [sys.executable, "-m", "alembic", "revision", "--autogenerate", "-m", "Auto migration"],
+            cwd=os.path.dirname(app_file_path)
+        )
     
     async def _alembic_upgrade(self, app_file_path: str) -> str:
         """Apply Alembic migrations"""
-        cmd = [sys.executable, "-m", "alembic", "upgrade", "head"]
-        
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error applying Alembic migrations: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        return await self._run_shell_command(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=os.path.dirname(app_file_path)
+        )
     
     async def _run_tests(self, app_file_path: str) -> str:
         """Run tests with pytest"""
-        cmd = [sys.executable, "-m", "pytest", "-v"]
-        
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error running tests: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        return await self._run_shell_command(
+            [sys.executable, "-m", "pytest", "-v"],
+            cwd=os.path.dirname(app_file_path)
+        )
     
-    async def _get_free_port(self) -> int:
-        """Get a free port to use for the server"""
-        import socket
+    def _bind_free_socket(self) -> socket.socket:
+        """
+        Bind a socket to a free local port for the server
         
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.bind(('', 0))
-        addr = s.getsockname()
-        s.close()
+        Binding to port 0 does not block, so this runs on the event loop.
         
-        return addr[1]
\ No newline at end of file
+        Returns:
+            An inheritable socket bound to 127.0.0.1 on an OS-assigned port
+        """
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind(("127.0.0.1", 0))
+        s.set_inheritable(True)
+        return s
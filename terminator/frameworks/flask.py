@@ -4,15 +4,190 @@ Flask Framework Module - Provides Flask-specific tooling
 
 import os
 import sys
+import time
 import logging
 import asyncio
-import subprocess
-from typing import Dict, List, Any, Optional, Set, Tuple, Callable
+from importlib.metadata import PackageNotFoundError, distributions, version
+from importlib.util import find_spec
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 
-from .base import FrameworkProvider
+from textual.app import App
+
+from .base import FrameworkProvider, SUBPROCESS_STREAM_LIMIT, search_app_file
 
 logger = logging.getLogger(__name__)
 
+# Command definitions shown in the framework toolbar; built once at import
+_FLASK_COMMANDS: List[Dict[str, Any]] = [
+    {
+        "id": "run",
+        "label": "Run Server",
+        "description": "Start the Flask development server",
+        "action": "run_server"
+    },
+    {
+        "id": "shell",
+        "label": "Flask Shell",
+        "description": "Run the Flask shell",
+        "action": "shell"
+    },
+    {
+        "id": "routes",
+        "label": "List Routes",
+        "description": "List all registered routes",
+        "action": "list_routes"
+    },
+    {
+        "id": "db-init",
+        "label": "Init DB",
+        "description": "Initialize the database (requires Flask-Migrate)",
+        "action": "db_init"
+    },
+    {
+        "id": "db-migrate",
+        "label": "DB Migrate",
+        "description": "Create a database migration (requires Flask-Migrate)",
+        "action": "db_migrate"
+    },
+    {
+        "id": "db-upgrade",
+        "label": "DB Upgrade",
+        "description": "Apply database migrations (requires Flask-Migrate)",
+        "action": "db_upgrade"
+    },
+    {
+        "id": "test",
+        "label": "Run Tests",
+        "description": "Run tests (using pytest)",
+        "action": "run_tests"
+    },
+    {
+        "id": "blueprint",
+        "label": "New Blueprint",
+        "description": "Create a new Flask blueprint",
+        "action": "new_blueprint"
+    }
+]
+
+# Steps shown by the New Blueprint command
+_BLUEPRINT_INSTRUCTIONS = """Blueprint creation requires user input.
+Use these steps in the terminal:
+
+1. Create a directory for your blueprint:
+   mkdir blueprints/new_blueprint
+
+2. Create an __init__.py file:
+   touch blueprints/new_blueprint/__init__.py
+
+3. Create a routes.py file with the blueprint definition:
+   
+   from flask import Blueprint, render_template
+   
+   bp = Blueprint('new_blueprint', __name__)
+   
+   @bp.route('/')
+   def index():
+       return render_template('new_blueprint/index.html')
+   
+4. Register the blueprint in your app:
+   
+   from blueprints.new_blueprint import bp as new_blueprint_bp
+   app.register_blueprint(new_blueprint_bp, url_prefix='/new')
+"""
+
+# Application file names, in order of preference
+_APP_FILE_CANDIDATES = ("app.py", "main.py", "wsgi.py", "application.py")
+
+# Seconds a get_project_info result is reused before probing again
+_PROJECT_INFO_TTL = 30
+
+# Database extensions reported by get_project_info
+_DB_EXTENSIONS = ("Flask-SQLAlchemy", "Flask-Migrate", "Flask-MongoEngine", "Flask-Peewee")
+
+# Seconds before a hung `flask routes` or `flask db ...` command is stopped
+_ROUTES_TIMEOUT = 10.0
+_DB_TIMEOUT = 120.0
+
+
+def _flask_version() -> Optional[str]:
+    """Return the installed Flask version, or None if Flask is not installed"""
+    try:
+        return version("flask")
+    except PackageNotFoundError:
+        return None
+
+
+def _flask_extensions() -> List[str]:
+    """Return the names of installed Flask-* distributions, without duplicates"""
+    names: Dict[str, str] = {}
+    for dist in distributions():
+        name = dist.metadata["Name"]
+        if name and "flask-" in name.lower():
+            names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def _find_db_extensions() -> List[str]:
+    """Return the database extensions whose module is importable, without importing it"""
+    found = []
+    for ext in _DB_EXTENSIONS:
+        try:
+            if find_spec(ext.lower().replace("-", "_")) is not None:
+                found.append(ext)
+        except (ImportError, ValueError):
+            pass
+    return found
+
+
+class AppFile(NamedTuple):
+    """Location of the Flask application file, split once when it is discovered"""
+    path: str
+    basename: str
+    dirname: str
+    # Relative to the workspace root, for display
+    relpath: str
+
+
+def _build_env(app_name: str, dev: bool) -> Dict[str, str]:
+    """
+    Build the environment for a flask command
+    
+    Built per command so changes to os.environ (PATH, virtualenv, user-set
+    variables) are picked up by the next command.
+    
+    Args:
+        app_name: Value for FLASK_APP
+        dev: Whether to also set FLASK_ENV=development
+        
+    Returns:
+        Copy of os.environ with the Flask variables set
+    """
+    env = os.environ.copy()
+    env["FLASK_APP"] = app_name
+    if dev:
+        env["FLASK_ENV"] = "development"
+    return env
+
+
+def _timed_out(seconds: float) -> str:
+    """Error message for a command stopped after its time limit"""
+    return f"Error: command timed out after {seconds:g} seconds"
+
+
+def _probe_flask_packages() -> Dict[str, Any]:
+    """
+    Collect Flask package details in one pass
+    
+    Returns:
+        Dictionary with the Flask version, Flask-* extensions and database extensions
+    """
+    return {
+        "version": _flask_version(),
+        "flask_exts": _flask_extensions(),
+        "db_exts": _find_db_extensions()
+    }
+
+
 class FlaskFrameworkProvider(FrameworkProvider):
     """
     Provides Flask-specific tooling for Terminator IDE
@@ -21,6 +196,81 @@ class FlaskFrameworkProvider(FrameworkProvider):
     and code generation capabilities.
     """
     
+    # Command ID -> handler method name, resolved once per call with getattr
+    _COMMAND_MAP: Dict[str, str] = {
+        "run": "_run_server",
+        "shell": "_shell",
+        "routes": "_list_routes",
+        "db-init": "_db_init",
+        "db-migrate": "_db_migrate",
+        "db-upgrade": "_db_upgrade",
+        "test": "_run_tests",
+        "blueprint": "_new_blueprint"
+    }
+    
+    def __init__(self, workspace_path: str, app: Optional[App] = None):
+        """
+        Initialize the Flask framework provider
+        
+        Args:
+            workspace_path: Root path of the project workspace
+            app: Terminator app instance (optional)
+        """
+        super().__init__(workspace_path, app)
+        # (app file path, workspace root mtime) from the last discovery
+        self._app_file_cache: Optional[Tuple[AppFile, float]] = None
+        # Last get_project_info result and when it was collected
+        self._project_info_cache: Optional[Dict[str, Any]] = None
+        self._project_info_cache_time: float = 0
+    
+    def clear_cache(self) -> None:
+        """Forget cached discovery results so the next command rescans the workspace"""
+        self._app_file_cache = None
+        self.invalidate_project_info()
+    
+    def invalidate_project_info(self) -> None:
+        """Force the next get_project_info call to collect fresh information"""
+        self._project_info_cache = None
+    
+    async def _find_app_file(self) -> Optional[AppFile]:
+        """
+        Locate the Flask application file (app.py, main.py, wsgi.py or application.py)
+        
+        The result is cached until the workspace root's modification time
+        changes or the cached file disappears.
+        
+        Returns:
+            Path to the application file, or None if none was found
+        """
+        # The stat calls and directory walk block, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._locate_app_file)
+    
+    def _locate_app_file(self) -> Optional[AppFile]:
+        """Blocking part of _find_app_file: validate the cache or search the workspace"""
+        try:
+            root_mtime = os.stat(self.workspace_path).st_mtime
+        except OSError:
+            return None
+            
+        if self._app_file_cache:
+            cached_file, cached_mtime = self._app_file_cache
+            if cached_mtime == root_mtime and os.path.exists(cached_file.path):
+                return cached_file
+                
+        app_file_path = search_app_file(self.workspace_path, _APP_FILE_CANDIDATES)
+        if not app_file_path:
+            return None
+            
+        app_file = AppFile(
+            app_file_path,
+            os.path.basename(app_file_path),
+            os.path.dirname(app_file_path),
+            os.path.relpath(app_file_path, self.workspace_path)
+        )
+        self._app_file_cache = (app_file, root_mtime)
+        return app_file
+    
     @property
     def framework_name(self) -> str:
         """Get the name of the framework"""
@@ -34,123 +284,41 @@ class FlaskFrameworkProvider(FrameworkProvider):
     @property
     def framework_commands(self) -> List[Dict[str, Any]]:
         """Get Flask-specific commands"""
-        return [
-            {
-                "id": "run",
-                "label": "Run Server",
-                "description": "Start the Flask development server",
-                "action": "run_server"
-            },
-            {
-                "id": "shell",
-                "label": "Flask Shell",
-                "description": "Run the Flask shell",
-                "action": "shell"
-            },
-            {
-                "id": "routes",
-                "label": "List Routes",
-                "description": "List all registered routes",
-                "action": "list_routes"
-            },
-            {
-                "id": "db-init",
-                "label": "Init DB",
-                "description": "Initialize the database (requires Flask-Migrate)",
-                "action": "db_init"
-            },
-            {
-                "id": "db-migrate",
-                "label": "DB Migrate",
-                "description": "Create a database migration (requires Flask-Migrate)",
-                "action": "db_migrate"
-            },
-            {
-                "id": "db-upgrade",
-                "label": "DB Upgrade",
-                "description": "Apply database migrations (requires Flask-Migrate)",
-                "action": "db_upgrade"
-            },
-            {
-                "id": "test",
-                "label": "Run Tests",
-                "description": "Run tests (using pytest)",
-                "action": "run_tests"
-            },
-            {
-                "id": "blueprint",
-                "label": "New Blueprint",
-                "description": "Create a new Flask blueprint",
-                "action": "new_blueprint"
-            }
-        ]
+        return _FLASK_COMMANDS
     
     async def get_project_info(self) -> Dict[str, Any]:
         """Get Flask project information"""
+        # Installed packages rarely change within a session, so reuse recent results
+        if (self._project_info_cache is not None
+                and time.monotonic() - self._project_info_cache_time < _PROJECT_INFO_TTL):
+            return dict(self._project_info_cache)
+            
         info = {}
         
         try:
-            # Look for app.py, main.py, or wsgi.py
-            app_files = ["app.py", "main.py", "wsgi.py", "application.py"]
-            app_file_path = None
-            
-            for file_name in app_files:
-                path = os.path.join(self.workspace_path, file_name)
-                if os.path.exists(path):
-                    app_file_path = path
-                    break
+            # App discovery and the package metadata probe are independent, so
+            # overlap them; the probe runs in one executor job with no interpreter spawned
+            loop = asyncio.get_running_loop()
+            app_file, packages = await asyncio.gather(
+                self._find_app_file(),
+                loop.run_in_executor(None, _probe_flask_packages)
+            )
             
-            if not app_file_path:
-                # Try to find in subdirectories
-                for root, _, files in os.walk(self.workspace_path):
-                    for file_name in app_files:
-                        if file_name in files:
-                            app_file_path = os.path.join(root, file_name)
-                            break
-                    if app_file_path:
-                        break
-                        
-            if app_file_path:
-                info["App File"] = os.path.relpath(app_file_path, self.workspace_path)
-                
-                # Try to get Flask version
-                version_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import flask; print(flask.__version__)"
-                ])
+            if app_file:
+                info["App File"] = app_file.relpath
                 
-                if version_output.strip():
-                    info["Flask Version"] = version_output.strip()
+                if packages["version"]:
+                    info["Flask Version"] = packages["version"]
                     
                 # Check for common Flask extensions
-                extensions_output = await self._run_shell_command([
-                    sys.executable, "-c", 
-                    "import pkg_resources; print('\\n'.join([d.project_name for d in pkg_resources.working_set if 'flask-' in d.project_name.lower()]))"
-                ])
-                
-                if extensions_output.strip():
-                    extensions = extensions_output.strip().split('\n')
+                extensions = packages["flask_exts"]
+                if extensions:
                     info["Extensions"] = ", ".join(extensions[:5])
                     if len(extensions) > 5:
                         info["Extensions"] += f" (and {len(extensions) - 5} more)"
                         
                 # Check for database extensions
-                db_extensions = [
-                    "Flask-SQLAlchemy",
-                    "Flask-Migrate",
-                    "Flask-MongoEngine",
-                    "Flask-Peewee"
-                ]
-                
-                db_found = []
-                for ext in db_extensions:
-                    ext_check = await self._run_shell_command([
-                        sys.executable, "-c", 
-                        f"try: import {ext.lower().replace('-', '_')}; print('Found'); except ImportError: print('Not found')"
-                    ])
-                    if "Found" in ext_check:
-                        db_found.append(ext)
-                        
+                db_found = packages["db_exts"]
                 if db_found:
                     info["Database"] = ", ".join(db_found)
                 
@@ -158,56 +326,33 @@ class FlaskFrameworkProvider(FrameworkProvider):
             logger.error(f"Error getting Flask project info: {str(e)}", exc_info=True)
             info["Error"] = str(e)
             
+        # Only a found app file with a completed probe is worth reusing; a missing
+        # file or failed probe is retried on the next call
+        if "App File" in info and "Error" not in info:
+            self._project_info_cache = dict(info)
+            self._project_info_cache_time = time.monotonic()
+            
         return info
     
     async def run_command(self, command_id: str) -> str:
         """Run a Flask-specific command"""
-        # Look for app.py, main.py, or wsgi.py
-        app_files = ["app.py", "main.py", "wsgi.py", "application.py"]
-        app_file_path = None
-        
-        for file_name in app_files:
-            path = os.path.join(self.workspace_path, file_name)
-            if os.path.exists(path):
-                app_file_path = path
-                break
+        # Blueprint instructions don't need the application file
+        app_file = await self._find_app_file() if command_id != "blueprint" else None
         
-        if not app_file_path and command_id != "blueprint":
-            # Try to find in subdirectories
-            for root, _, files in os.walk(self.workspace_path):
-                for file_name in app_files:
-                    if file_name in files:
-                        app_file_path = os.path.join(root, file_name)
-                        break
-                if app_file_path:
-                    break
-                    
-        if not app_file_path and command_id != "blueprint":
+        if not app_file and command_id != "blueprint":
             return "Error: Could not find Flask application file (app.py, main.py, wsgi.py, or application.py)"
         
         # Call the appropriate method based on command_id
-        command_map = {
-            "run": self._run_server,
-            "shell": self._shell,
-            "routes": self._list_routes,
-            "db-init": self._db_init,
-            "db-migrate": self._db_migrate,
-            "db-upgrade": self._db_upgrade,
-            "test": self._run_tests,
-            "blueprint": self._new_blueprint
-        }
-        
-        if command_id in command_map:
-            return await command_map[command_id](app_file_path)
+        method_name = self._COMMAND_MAP.get(command_id)
+        if method_name:
+            return await getattr(self, method_name)(app_file)
         else:
             return f"Error: Unknown command '{command_id}'"
     
-    async def _run_server(self, app_file_path: str) -> str:
+    async def _run_server(self, app_file: AppFile) -> str:
         """Start the Flask development server"""
         # Set Flask environment variables
-        env = os.environ.copy()
-        env["FLASK_APP"] = os.path.basename(app_file_path)
-        env["FLASK_ENV"] = "development"
+        env = _build_env(app_file.basename, True)
         
         cmd = [sys.executable, "-m", "flask", "run", "--debugger", "--reload"]
         
@@ -216,215 +361,101 @@ class FlaskFrameworkProvider(FrameworkProvider):
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path),
-                env=env
+                # The dev server logs requests to stderr; merge it into one pipe
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=app_file.dirname,
+                env=env,
+                limit=SUBPROCESS_STREAM_LIMIT,
+                # Own process group, so the reloader's child is stopped with it
+                start_new_session=True
             )
             
             # Initial message
-            initial_output = "Starting Flask development server...\n"
-            if self.output_callback:
-                self.output_callback(initial_output)
+            self.output_callback("Starting Flask development server...\n")
                 
             # Read stdout incrementally
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_str = line.decode("utf-8")
-                if self.output_callback:
-                    self.output_callback(initial_output + line_str)
-                    initial_output = ""  # Only include it once
+            assert process.stdout is not None
+            try:
+                await self._forward_stream(process.stdout, self.output_callback)
+            except asyncio.CancelledError:
+                await self._terminate_process(process)
+                raise
             
             return "Flask server stopped"
         else:
             # Run in blocking mode and return full output
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=os.path.dirname(app_file_path),
-                    env=env
-                )
-                
-                stdout, stderr = await process.communicate()
-                
-                if process.returncode == 0:
-                    return stdout.decode("utf-8")
-                else:
-                    return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                    
-            except Exception as e:
-                logger.error(f"Error running Flask server: {str(e)}", exc_info=True)
-                return f"Error: {str(e)}"
+            return await self._run_shell_command(cmd, cwd=app_file.dirname, env=env)
     
-    async def _shell(self, app_file_path: str) -> str:
+    async def _shell(self, app_file: AppFile) -> str:
         """Run the Flask shell"""
         # Note: In a real implementation, this would launch an interactive shell
         return "Flask shell is not supported in this UI. Use the terminal instead."
     
-    async def _list_routes(self, app_file_path: str) -> str:
+    async def _list_routes(self, app_file: AppFile) -> str:
         """List all registered routes"""
-        # Set Flask environment variables
-        env = os.environ.copy()
-        env["FLASK_APP"] = os.path.basename(app_file_path)
-        
-        cmd = [sys.executable, "-m", "flask", "routes"]
-        
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path),
-                env=env
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error listing routes: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+            async with asyncio.timeout(_ROUTES_TIMEOUT):
+                return await self._run_flask_cli(["routes"], app_file)
+        except TimeoutError:
+            return _timed_out(_ROUTES_TIMEOUT)
     
-    async def _db_init(self, app_file_path: str) -> str:
+    async def _db_init(self, app_file: AppFile) -> str:
         """Initialize the database (requires Flask-Migrate)"""
-        # Set Flask environment variables
-        env = os.environ.copy()
-        env["FLASK_APP"] = os.path.basename(app_file_path)
-        
-        cmd = [sys.executable, "-m", "flask", "db", "init"]
-        
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path),
-                env=env
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error initializing database: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+            async with asyncio.timeout(_DB_TIMEOUT):
+                return await self._run_flask_cli(["db", "init"], app_file)
+        except TimeoutError:
+            return _timed_out(_DB_TIMEOUT)
     
-    async def _db_migrate(self, app_file_path: str) -> str:
+    async def _db_migrate(self, app_file: AppFile) -> str:
         """Create a database migration (requires Flask-Migrate)"""
-        # Set Flask environment variables
-        env = os.environ.copy()
-        env["FLASK_APP"] = os.path.basename(app_file_path)
-        
-        cmd = [sys.executable, "-m", "flask", "db", "migrate", "-m", "Auto migration"]
-        
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path),
-                env=env
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error creating migration: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+            async with asyncio.timeout(_DB_TIMEOUT):
+                return await self._run_flask_cli(
+                    ["db", "migrate", "-m", "Auto migration"], app_file
+                )
+        except TimeoutError:
+            return _timed_out(_DB_TIMEOUT)
     
-    async def _db_upgrade(self, app_file_path: str) -> str:
+    async def _db_upgrade(self, app_file: AppFile) -> str:
         """Apply database migrations (requires Flask-Migrate)"""
-        # Set Flask environment variables
-        env = os.environ.copy()
-        env["FLASK_APP"] = os.path.basename(app_file_path)
-        
-        cmd = [sys.executable, "-m", "flask", "db", "upgrade"]
-        
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path),
-                env=env
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error upgrading database: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+            async with asyncio.timeout(_DB_TIMEOUT):
+                return await self._run_flask_cli(["db", "upgrade"], app_file)
+        except TimeoutError:
+            return _timed_out(_DB_TIMEOUT)
     
-    async def _run_tests(self, app_file_path: str) -> str:
+    async def _run_tests(self, app_file: AppFile) -> str:
         """Run tests (using pytest)"""
-        cmd = [sys.executable, "-m", "pytest", "-v"]
+        return await self._run_shell_command(
+            [sys.executable, "-m", "pytest", "-v"],
+            self.output_callback,
+            cwd=app_file.dirname
+        )
+    
+    async def _run_flask_cli(self, args: List[str], app_file: AppFile) -> str:
+        """
+        Run a `flask` CLI subcommand against the application file
         
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(app_file_path)
-            )
-            
-            stdout, stderr = await process.communicate()
+        Output is forwarded to the output callback as it is produced, if one is set.
+        Cancelling the call (e.g. from an enclosing asyncio.timeout) stops the command.
+        
+        Args:
+            args: Arguments following `flask`
+            app_file: Flask application file
             
-            if process.returncode == 0:
-                return stdout.decode("utf-8")
-            else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
-                
-        except Exception as e:
-            logger.error(f"Error running tests: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+        Returns:
+            Command output or an error message
+        """
+        return await self._run_shell_command(
+            [sys.executable, "-m", "flask", *args],
+            self.output_callback,
+            cwd=app_file.dirname,
+            env=_build_env(app_file.basename, False)
+        )
     
-    async def _new_blueprint(self, app_file_path: str) -> str:
+    async def _new_blueprint(self, app_file: Optional[AppFile]) -> str:
         """Create a new Flask blueprint"""
         # Note: In a real implementation, this would prompt for the blueprint name
         # and create the necessary files
-        return """Blueprint creation requires user input.
-Use these steps in the terminal:
-
-1. Create a directory for your blueprint:
-   mkdir blueprints/new_blueprint
-
-2. Create an __init__.py file:
-   touch blueprints/new_blueprint/__init__.py
-
-3. Create a routes.py file with the blueprint definition:
-   
-   from flask import Blueprint, render_template
-   
-   bp = Blueprint('new_blueprint', __name__)
-   
-   @bp.route('/')
-   def index():
-       return render_template('new_blueprint/index.html')
-   
-4. Register the blueprint in your app:
-   
-   from blueprints.new_blueprint import bp as new_blueprint_bp
-   app.register_blueprint(new_blueprint_bp, url_prefix='/new')
-"""
\ No newline at end of file
+        return _BLUEPRINT_INSTRUCTIONS
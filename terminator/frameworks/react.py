@@ -3,17 +3,257 @@ React Framework Module - Provides React-specific tooling
 """
 
 import os
-import sys
-import json
+import glob
 import logging
+import functools
 import asyncio
-import subprocess
-from typing import Dict, List, Any, Optional, Set, Tuple, Callable
+from typing import AbstractSet, Dict, List, Any, Optional, Tuple
 
-from .base import FrameworkProvider
+from textual.app import App
+
+from .base import FrameworkProvider, read_package_json
 
 logger = logging.getLogger(__name__)
 
+# Bytes per read when forwarding dev server output; small reads keep
+# progress output flowing instead of waiting for a large buffer to fill
+_DEV_SERVER_CHUNK_SIZE = 4096
+
+# The only package.json fields the provider reads
+_PACKAGE_JSON_FIELDS = ("dependencies", "devDependencies", "scripts")
+
+# Returned when package.json is missing or disappears before it is read
+_PACKAGE_JSON_MISSING = "Error: package.json not found. Is this a React project?"
+
+# Top-level build output directories, in the order they are reported
+_BUILD_DIR_ORDER = ("build", "dist", "out", ".next")
+_BUILD_DIRS = frozenset(_BUILD_DIR_ORDER)
+
+# Library detection tables: (package names, label), in display order.
+# A library is reported if any of its package names is a dependency.
+_FRAMEWORK_MAP = (
+    (("next",), "Next.js"),
+    (("react-scripts",), "Create React App"),
+    (("gatsby",), "Gatsby"),
+    (("@remix-run/react",), "Remix"),
+)
+
+_STATE_LIBRARY_MAP = (
+    (("redux",), "Redux"),
+    (("mobx",), "MobX"),
+    (("recoil",), "Recoil"),
+    (("jotai",), "Jotai"),
+    (("zustand",), "Zustand"),
+)
+
+_UI_LIBRARY_MAP = (
+    (("material-ui", "@mui/material"), "Material UI"),
+    (("antd",), "Ant Design"),
+    (("chakra-ui", "@chakra-ui/react"), "Chakra UI"),
+    (("tailwindcss",), "Tailwind CSS"),
+    (("styled-components",), "styled-components"),
+    (("emotion", "@emotion/react"), "Emotion"),
+)
+
+_TESTING_LIBRARY_MAP = (
+    (("jest",), "Jest"),
+    (("cypress",), "Cypress"),
+)
+
+
+# Files suggested by the "New Component" command; fixed text, so built once
+_COMPONENT_TEMPLATE = """import React from 'react';
+import './NewComponent.css';
+
+interface NewComponentProps {
+  title: string;
+  description?: string;
+}
+
+const NewComponent: React.FC<NewComponentProps> = ({ title, description }) => {
+  return (
+    <div className="new-component">
+      <h2>{title}</h2>
+      {description && <p>{description}</p>}
+    </div>
+  );
+};
+
+export default NewComponent;
+"""
+
+_CSS_TEMPLATE = """.new-component {
+  padding: 1rem;
+  border: 1px solid #ccc;
+  border-radius: 4px;
+}
+
+.new-component h2 {
+  margin-top: 0;
+  color: #333;
+}
+
+.new-component p {
+  color: #666;
+}
+"""
+
+_TEST_TEMPLATE = """import React from 'react';
+import { render, screen } from '@testing-library/react';
+import NewComponent from './NewComponent';
+
+describe('NewComponent', () => {
+  it('renders the title', () => {
+    render(<NewComponent title="Test Title" />);
+    const titleElement = screen.getByText(/Test Title/i);
+    expect(titleElement).toBeInTheDocument();
+  });
+
+  it('renders the description when provided', () => {
+    render(<NewComponent title="Test Title" description="Test Description" />);
+    const descElement = screen.getByText(/Test Description/i);
+    expect(descElement).toBeInTheDocument();
+  });
+
+  it('does not render the description when not provided', () => {
+    render(<NewComponent title="Test Title" />);
+    const descElement = screen.queryByText(/Test Description/i);
+    expect(descElement).not.toBeInTheDocument();
+  });
+});
+"""
+
+_NEW_COMPONENT_RESPONSE = ("""To create a new React component, create the following files:
+
+1. src/components/NewComponent/NewComponent.tsx
+```tsx
+"""
+    + _COMPONENT_TEMPLATE
+    + """
+```
+
+2. src/components/NewComponent/NewComponent.css
+```css
+"""
+    + _CSS_TEMPLATE
+    + """
+```
+
+3. src/components/NewComponent/NewComponent.test.tsx
+```tsx
+"""
+    + _TEST_TEMPLATE
+    + """
+```
+
+4. src/components/NewComponent/index.ts
+```ts
+export { default } from './NewComponent';
+```
+
+Then you can use the component like this:
+```tsx
+import NewComponent from './components/NewComponent';
+
+function App() {
+  return (
+    <div className="App">
+      <NewComponent title="Hello World" description="This is a new component" />
+    </div>
+  );
+}
+```""")
+
+
+@functools.lru_cache(maxsize=32)
+def _read_package_fields(path: str, mtime_ns: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the package.json fields the provider reads, on top of the shared parse
+    
+    Each field is always present and always a dict, so callers can index it
+    without checking for missing or malformed sections. The returned dict is
+    shared between callers and must not be modified.
+    
+    Args:
+        path: Path to package.json
+        mtime_ns: st_mtime_ns of the file, used only as part of the cache key
+        
+    Returns:
+        The dependencies, devDependencies and scripts fields
+    """
+    package_data = read_package_json(path, mtime_ns)
+    if not isinstance(package_data, dict):
+        package_data = {}
+    fields = {}
+    for key in _PACKAGE_JSON_FIELDS:
+        value = package_data.get(key)
+        fields[key] = value if isinstance(value, dict) else {}
+    return fields
+
+
+def _stat_and_read_package_json(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Stat package.json and return the fields the provider reads from the cache
+    
+    A single small read is cheaper done synchronously in one worker thread
+    than split into separate stat and read hops.
+    
+    Args:
+        path: Path to package.json
+        
+    Returns:
+        The dependencies, devDependencies and scripts fields
+    """
+    return _read_package_fields(path, os.stat(path).st_mtime_ns)
+
+
+def _find_build_dir(workspace_path: str) -> Optional[str]:
+    """
+    Find the directory a build wrote its output to
+    
+    Top-level candidates are matched in a single scandir pass instead of
+    one stat each; only the nested public/build needs its own check.
+    
+    Args:
+        workspace_path: Root path of the project workspace
+        
+    Returns:
+        The build directory relative to the workspace, or None if not found
+    """
+    found = set()
+    try:
+        with os.scandir(workspace_path) as it:
+            for entry in it:
+                if (entry.name in _BUILD_DIRS or entry.name == "public") and entry.is_dir():
+                    found.add(entry.name)
+    except OSError as e:
+        logger.error(f"Error scanning {workspace_path}: {str(e)}")
+        return None
+        
+    for dir_name in _BUILD_DIR_ORDER:
+        if dir_name in found:
+            return dir_name
+            
+    if "public" in found and os.path.isdir(os.path.join(workspace_path, "public", "build")):
+        return "public/build"
+    return None
+
+
+def _detect_libraries(table: Tuple[Tuple[Tuple[str, ...], str], ...],
+                      keys: AbstractSet[str]) -> List[str]:
+    """
+    Return the labels of the libraries in a detection table that are dependencies
+    
+    Args:
+        table: Detection table of (package names, label) pairs
+        keys: All dependency names of the project
+        
+    Returns:
+        Matching labels in table order
+    """
+    return [label for names, label in table if not keys.isdisjoint(names)]
+
+
 class ReactFrameworkProvider(FrameworkProvider):
     """
     Provides React-specific tooling for Terminator IDE
@@ -22,6 +262,61 @@ class ReactFrameworkProvider(FrameworkProvider):
     and code generation capabilities.
     """
     
+    # Command ID -> handler method name, resolved once per call with getattr
+    _COMMAND_MAP: Dict[str, str] = {
+        "start": "_start_dev_server",
+        "build": "_build",
+        "test": "_run_tests",
+        "lint": "_lint",
+        "new-component": "_new_component",
+        "analyze": "_analyze_bundle",
+        "storybook": "_storybook",
+        "eject": "_eject"
+    }
+    
+    def __init__(self, workspace_path: str, app: Optional[App] = None):
+        """
+        Initialize the React framework provider
+        
+        Args:
+            workspace_path: Root path of the project workspace
+            app: Terminator app instance (optional)
+        """
+        super().__init__(workspace_path, app)
+        self._package_json_path = os.path.join(workspace_path, "package.json")
+        # "npm" or "yarn", decided on first use
+        self._package_manager: Optional[str] = None
+    
+    def clear_cache(self) -> None:
+        """Forget the cached package manager choice"""
+        self._package_manager = None
+    
+    async def _load_package_json(
+        self, pkg_stat: Optional[os.stat_result] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load the workspace package.json through the shared parse cache
+        
+        The cache is invalidated by modification time, so edits to
+        package.json are picked up on the next call.
+        
+        Args:
+            pkg_stat: Stat of package.json already taken by the caller, if any
+        
+        Returns:
+            The dependencies, devDependencies and scripts fields of package.json
+            (shared, not to be modified), or None if the file does not exist
+        """
+        try:
+            if pkg_stat is not None:
+                return await asyncio.to_thread(
+                    _read_package_fields, self._package_json_path, pkg_stat.st_mtime_ns
+                )
+            # Stat and, only if changed, read in a single worker-thread hop
+            return await asyncio.to_thread(_stat_and_read_package_json, self._package_json_path)
+        except FileNotFoundError:
+            return None
+    
     @property
     def framework_name(self) -> str:
         """Get the name of the framework"""
@@ -92,98 +387,37 @@ class ReactFrameworkProvider(FrameworkProvider):
         
         try:
             # Look for package.json
-            package_json_path = os.path.join(self.workspace_path, "package.json")
+            package_data = await self._load_package_json()
             
-            if os.path.exists(package_json_path):
-                with open(package_json_path, "r") as f:
-                    package_data = json.load(f)
-                    
+            if package_data is not None:
                 # Get React version
                 dependencies = package_data.get("dependencies", {})
                 dev_dependencies = package_data.get("devDependencies", {})
+                # Every dependency name, for O(1) membership tests below
+                all_keys = dependencies.keys() | dev_dependencies.keys()
                 
                 if "react" in dependencies:
                     info["React Version"] = dependencies["react"]
                     
                 # Check for common React frameworks/libraries
-                frameworks = []
-                
-                # Next.js
-                if "next" in dependencies or "next" in dev_dependencies:
-                    frameworks.append("Next.js")
-                    
-                # Create React App
-                if ("react-scripts" in dependencies or "react-scripts" in dev_dependencies):
-                    frameworks.append("Create React App")
-                    
-                # Gatsby
-                if "gatsby" in dependencies or "gatsby" in dev_dependencies:
-                    frameworks.append("Gatsby")
-                    
-                # Remix
-                if "@remix-run/react" in dependencies or "@remix-run/react" in dev_dependencies:
-                    frameworks.append("Remix")
-                
+                frameworks = _detect_libraries(_FRAMEWORK_MAP, all_keys)
                 if frameworks:
                     info["Frameworks"] = ", ".join(frameworks)
                     
                 # State management
-                state_libs = []
-                
-                if "redux" in dependencies or "redux" in dev_dependencies:
-                    state_libs.append("Redux")
-                    
-                if "mobx" in dependencies or "mobx" in dev_dependencies:
-                    state_libs.append("MobX")
-                    
-                if "recoil" in dependencies or "recoil" in dev_dependencies:
-                    state_libs.append("Recoil")
-                    
-                if "jotai" in dependencies or "jotai" in dev_dependencies:
-                    state_libs.append("Jotai")
-                    
-                if "zustand" in dependencies or "zustand" in dev_dependencies:
-                    state_libs.append("Zustand")
-                    
+                state_libs = _detect_libraries(_STATE_LIBRARY_MAP, all_keys)
                 if state_libs:
                     info["State Management"] = ", ".join(state_libs)
                     
                 # UI libraries
-                ui_libs = []
-                
-                if "material-ui" in dependencies or "@mui/material" in dependencies:
-                    ui_libs.append("Material UI")
-                    
-                if "antd" in dependencies:
-                    ui_libs.append("Ant Design")
-                    
-                if "chakra-ui" in dependencies or "@chakra-ui/react" in dependencies:
-                    ui_libs.append("Chakra UI")
-                    
-                if "tailwindcss" in dependencies or "tailwindcss" in dev_dependencies:
-                    ui_libs.append("Tailwind CSS")
-                    
-                if "styled-components" in dependencies:
-                    ui_libs.append("styled-components")
-                    
-                if "emotion" in dependencies or "@emotion/react" in dependencies:
-                    ui_libs.append("Emotion")
-                    
+                ui_libs = _detect_libraries(_UI_LIBRARY_MAP, all_keys)
                 if ui_libs:
                     info["UI Libraries"] = ", ".join(ui_libs)
                     
-                # Testing
-                test_libs = []
-                
-                if "jest" in dependencies or "jest" in dev_dependencies:
-                    test_libs.append("Jest")
-                    
-                if "testing-library" in json.dumps(dependencies) or "testing-library" in json.dumps(dev_dependencies):
+                # Testing; Testing Library ships as many @testing-library/* packages
+                test_libs = _detect_libraries(_TESTING_LIBRARY_MAP, all_keys)
+                if any("testing-library" in name for name in all_keys):
                     test_libs.append("Testing Library")
-                    
-                if "cypress" in dependencies or "cypress" in dev_dependencies:
-                    test_libs.append("Cypress")
-                    
                 if test_libs:
                     info["Testing"] = ", ".join(test_libs)
                     
@@ -203,37 +437,28 @@ class ReactFrameworkProvider(FrameworkProvider):
     
     async def run_command(self, command_id: str) -> str:
         """Run a React-specific command"""
-        # Check for package.json
-        package_json_path = os.path.join(self.workspace_path, "package.json")
-        
-        if not os.path.exists(package_json_path):
-            return "Error: package.json not found. Is this a React project?"
+        # Check for package.json; the handler reuses the stat to load it
+        try:
+            pkg_stat = os.stat(self._package_json_path)
+        except FileNotFoundError:
+            return _PACKAGE_JSON_MISSING
             
         # Call the appropriate method based on command_id
-        command_map = {
-            "start": self._start_dev_server,
-            "build": self._build,
-            "test": self._run_tests,
-            "lint": self._lint,
-            "new-component": self._new_component,
-            "analyze": self._analyze_bundle,
-            "storybook": self._storybook,
-            "eject": self._eject
-        }
-        
-        if command_id in command_map:
-            return await command_map[command_id]()
-        else:
+        method_name = self._COMMAND_MAP.get(command_id)
+        if not method_name:
             return f"Error: Unknown command '{command_id}'"
+            
+        return await getattr(self, method_name)(pkg_stat)
     
-    async def _start_dev_server(self) -> str:
+    async def _start_dev_server(self, pkg_stat: os.stat_result) -> str:
         """Start the React development server"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Get the start script from package.json
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         scripts = package_data.get("scripts", {})
         
@@ -259,25 +484,19 @@ class ReactFrameworkProvider(FrameworkProvider):
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                # Compile errors go to stderr; merge it so they show up right away
+                stderr=asyncio.subprocess.STDOUT,
                 cwd=self.workspace_path
             )
             
             # Initial message
-            initial_output = f"Starting React development server with {package_manager}...\n"
-            if self.output_callback:
-                self.output_callback(initial_output)
+            self.output_callback(f"Starting React development server with {package_manager}...\n")
                 
-            # Read stdout incrementally
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_str = line.decode("utf-8")
-                if self.output_callback:
-                    self.output_callback(initial_output + line_str)
-                    initial_output = ""  # Only include it once
+            # Forward output as it arrives; webpack progress lines end in "\r"
+            await self._forward_stream(
+                process.stdout, self.output_callback,
+                chunk_size=_DEV_SERVER_CHUNK_SIZE, split_cr=True
+            )
             
             return "React development server stopped"
         else:
@@ -293,22 +512,24 @@ class ReactFrameworkProvider(FrameworkProvider):
                 stdout, stderr = await process.communicate()
                 
                 if process.returncode == 0:
-                    return stdout.decode("utf-8")
+                    return stdout.decode("utf-8", errors="replace")
                 else:
-                    return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                    stderr_text = stderr.decode("utf-8", errors="replace")
+                    return f"Error ({process.returncode}):\n{stderr_text}"
                     
             except Exception as e:
                 logger.error(f"Error starting React development server: {str(e)}", exc_info=True)
                 return f"Error: {str(e)}"
     
-    async def _build(self) -> str:
+    async def _build(self, pkg_stat: os.stat_result) -> str:
         """Build the React application"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Get the build script from package.json
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         scripts = package_data.get("scripts", {})
         
@@ -329,39 +550,41 @@ class ReactFrameworkProvider(FrameworkProvider):
                 cwd=self.workspace_path
             )
             
-            stdout, stderr = await process.communicate()
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                # Don't leave a cancelled build running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
             
             if process.returncode == 0:
                 # Check for build directory
-                build_dirs = ["build", "dist", "out", ".next", "public/build"]
-                build_dir = None
-                
-                for dir_name in build_dirs:
-                    if os.path.exists(os.path.join(self.workspace_path, dir_name)):
-                        build_dir = dir_name
-                        break
+                build_dir = _find_build_dir(self.workspace_path)
                         
-                result = stdout.decode("utf-8")
+                result = stdout.decode("utf-8", errors="replace")
                 
                 if build_dir:
                     result += f"\n\nBuild output directory: {build_dir}/"
                     
                 return result
             else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                return f"Error ({process.returncode}):\n{stderr.decode('utf-8', errors='replace')}"
                 
         except Exception as e:
             logger.error(f"Error building React application: {str(e)}", exc_info=True)
             return f"Error: {str(e)}"
     
-    async def _run_tests(self) -> str:
+    async def _run_tests(self, pkg_stat: os.stat_result) -> str:
         """Run React tests"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Get the test script from package.json
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         scripts = package_data.get("scripts", {})
         
@@ -385,22 +608,23 @@ class ReactFrameworkProvider(FrameworkProvider):
             stdout, stderr = await process.communicate()
             
             if process.returncode == 0:
-                return stdout.decode("utf-8")
+                return stdout.decode("utf-8", errors="replace")
             else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                return f"Error ({process.returncode}):\n{stderr.decode('utf-8', errors='replace')}"
                 
         except Exception as e:
             logger.error(f"Error running React tests: {str(e)}", exc_info=True)
             return f"Error: {str(e)}"
     
-    async def _lint(self) -> str:
+    async def _lint(self, pkg_stat: os.stat_result) -> str:
         """Lint the React code"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Get the lint script from package.json
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         scripts = package_data.get("scripts", {})
         
@@ -438,121 +662,31 @@ class ReactFrameworkProvider(FrameworkProvider):
             stdout, stderr = await process.communicate()
             
             if process.returncode == 0:
-                return stdout.decode("utf-8") or "Linting passed! No issues found."
+                output = stdout.decode("utf-8", errors="replace")
+                return output or "Linting passed! No issues found."
             else:
-                return f"Linting found issues:\n{stderr.decode('utf-8')}" if stderr else stdout.decode("utf-8")
+                if stderr:
+                    return f"Linting found issues:\n{stderr.decode('utf-8', errors='replace')}"
+                return stdout.decode("utf-8", errors="replace")
                 
         except Exception as e:
             logger.error(f"Error linting React code: {str(e)}", exc_info=True)
             return f"Error: {str(e)}"
     
-    async def _new_component(self) -> str:
+    async def _new_component(self, pkg_stat: os.stat_result) -> str:
         """Create a new React component"""
         # In a real implementation, this would prompt for component name and type
-        component_template = """import React from 'react';
-import './NewComponent.css';
-
-interface NewComponentProps {
-  title: string;
-  description?: string;
-}
-
-const NewComponent: React.FC<NewComponentProps> = ({ title, description }) => {
-  return (
-    <div className="new-component">
-      <h2>{title}</h2>
-      {description && <p>{description}</p>}
-    </div>
-  );
-};
-
-export default NewComponent;
-"""
-
-        css_template = """.new-component {
-  padding: 1rem;
-  border: 1px solid #ccc;
-  border-radius: 4px;
-}
-
-.new-component h2 {
-  margin-top: 0;
-  color: #333;
-}
-
-.new-component p {
-  color: #666;
-}
-"""
-
-        test_template = """import React from 'react';
-import { render, screen } from '@testing-library/react';
-import NewComponent from './NewComponent';
-
-describe('NewComponent', () => {
-  it('renders the title', () => {
-    render(<NewComponent title="Test Title" />);
-    const titleElement = screen.getByText(/Test Title/i);
-    expect(titleElement).toBeInTheDocument();
-  });
-
-  it('renders the description when provided', () => {
-    render(<NewComponent title="Test Title" description="Test Description" />);
-    const descElement = screen.getByText(/Test Description/i);
-    expect(descElement).toBeInTheDocument();
-  });
-
-  it('does not render the description when not provided', () => {
-    render(<NewComponent title="Test Title" />);
-    const descElement = screen.queryByText(/Test Description/i);
-    expect(descElement).not.toBeInTheDocument();
-  });
-});
-"""
-
-        return f"""To create a new React component, create the following files:
-
-1. src/components/NewComponent/NewComponent.tsx
-```tsx
-{component_template}
-```
-
-2. src/components/NewComponent/NewComponent.css
-```css
-{css_template}
-```
-
-3. src/components/NewComponent/NewComponent.test.tsx
-```tsx
-{test_template}
-```
-
-4. src/components/NewComponent/index.ts
-```ts
-export { default } from './NewComponent';
-```
-
-Then you can use the component like this:
-```tsx
-import NewComponent from './components/NewComponent';
-
-function App() {
-  return (
-    <div className="App">
-      <NewComponent title="Hello World" description="This is a new component" />
-    </div>
-  );
-}
-```"""
+        return _NEW_COMPONENT_RESPONSE
     
-    async def _analyze_bundle(self) -> str:
+    async def _analyze_bundle(self, pkg_stat: os.stat_result) -> str:
         """Analyze the bundle size"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Check if source-map-explorer is installed
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         dependencies = package_data.get("dependencies", {})
         dev_dependencies = package_data.get("devDependencies", {})
@@ -572,14 +706,35 @@ Or run the build with sourcemaps enabled:
 GENERATE_SOURCEMAP=true npm run build
 """
             
-        # Build first
-        build_result = await self._build()
+        # Check that the tool is installed before spending time on a build. Yarn
+        # Plug'n'Play installs have no node_modules/.bin, so there a missing
+        # binary is only a warning and yarn resolves the tool itself
+        warning = ""
+        tool_path = os.path.join(self.workspace_path, "node_modules", ".bin", "source-map-explorer")
+        if not os.path.exists(tool_path):
+            if not self._uses_yarn_pnp():
+                return f"""Error: source-map-explorer is listed in package.json but not installed.
+
+Install dependencies with:
+{package_manager} install"""
+            warning = "Warning: source-map-explorer not found in node_modules/.bin (Yarn PnP)\n\n"
+            
+        build_result = await self._build(pkg_stat)
+        if build_result.startswith("Error"):
+            return build_result
         
+        # Expand the bundle glob here rather than relying on a shell in the child
+        js_files = await asyncio.to_thread(
+            glob.glob, os.path.join(self.workspace_path, "build", "static", "js", "*.js")
+        )
+        if not js_files:
+            return "Error: The build produced no JavaScript bundles in build/static/js/"
+            
         # Now analyze the bundle
         if package_manager == "yarn":
-            cmd = ["yarn", "source-map-explorer", "build/static/js/*.js"]
+            cmd = ["yarn", "source-map-explorer", *sorted(js_files)]
         else:
-            cmd = ["npx", "source-map-explorer", "build/static/js/*.js"]
+            cmd = ["npx", "source-map-explorer", *sorted(js_files)]
             
         try:
             process = await asyncio.create_subprocess_exec(
@@ -592,22 +747,30 @@ GENERATE_SOURCEMAP=true npm run build
             stdout, stderr = await process.communicate()
             
             if process.returncode == 0:
-                return stdout.decode("utf-8")
+                return warning + stdout.decode("utf-8", errors="replace")
             else:
-                return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                return f"Error ({process.returncode}):\n{stderr.decode('utf-8', errors='replace')}"
                 
         except Exception as e:
             logger.error(f"Error analyzing bundle: {str(e)}", exc_info=True)
             return f"Error: {str(e)}"
     
-    async def _storybook(self) -> str:
+    def _uses_yarn_pnp(self) -> bool:
+        """Check whether dependencies are installed with Yarn Plug'n'Play"""
+        return any(
+            os.path.exists(os.path.join(self.workspace_path, name))
+            for name in (".pnp.cjs", ".pnp.js")
+        )
+    
+    async def _storybook(self, pkg_stat: os.stat_result) -> str:
         """Start Storybook"""
         # Check if we should use npm or yarn
         package_manager = await self._get_package_manager()
         
         # Check if Storybook is installed
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
             
         scripts = package_data.get("scripts", {})
         
@@ -636,25 +799,19 @@ npx sb init
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                # Compile errors go to stderr; merge it so they show up right away
+                stderr=asyncio.subprocess.STDOUT,
                 cwd=self.workspace_path
             )
             
             # Initial message
-            initial_output = f"Starting Storybook with {package_manager}...\n"
-            if self.output_callback:
-                self.output_callback(initial_output)
+            self.output_callback(f"Starting Storybook with {package_manager}...\n")
                 
-            # Read stdout incrementally
-            while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
-                    
-                line_str = line.decode("utf-8")
-                if self.output_callback:
-                    self.output_callback(initial_output + line_str)
-                    initial_output = ""  # Only include it once
+            # Forward output as it arrives; webpack progress lines end in "\r"
+            await self._forward_stream(
+                process.stdout, self.output_callback,
+                chunk_size=_DEV_SERVER_CHUNK_SIZE, split_cr=True
+            )
             
             return "Storybook stopped"
         else:
@@ -670,27 +827,25 @@ npx sb init
                 stdout, stderr = await process.communicate()
                 
                 if process.returncode == 0:
-                    return stdout.decode("utf-8")
+                    return stdout.decode("utf-8", errors="replace")
                 else:
-                    return f"Error ({process.returncode}):\n{stderr.decode('utf-8')}"
+                    stderr_text = stderr.decode("utf-8", errors="replace")
+                    return f"Error ({process.returncode}):\n{stderr_text}"
                     
             except Exception as e:
                 logger.error(f"Error starting Storybook: {str(e)}", exc_info=True)
                 return f"Error: {str(e)}"
     
-    async def _eject(self) -> str:
+    async def _eject(self, pkg_stat: os.stat_result) -> str:
         """Eject from Create React App"""
-        # Check if we should use npm or yarn
-        package_manager = await self._get_package_manager()
-        
-        # Check if this is a Create React App project
-        with open(os.path.join(self.workspace_path, "package.json"), "r") as f:
-            package_data = json.load(f)
-            
-        dependencies = package_data.get("dependencies", {})
-        dev_dependencies = package_data.get("devDependencies", {})
+        # Check if this is a Create React App project; the answer is a static
+        # message, so the package manager is not needed
+        package_data = await self._load_package_json(pkg_stat)
+        if package_data is None:
+            return _PACKAGE_JSON_MISSING
         
-        is_cra = "react-scripts" in dependencies or "react-scripts" in dev_dependencies
+        is_cra = ("react-scripts" in package_data.get("dependencies", {})
+                  or "react-scripts" in package_data.get("devDependencies", {}))
         
         if not is_cra:
             return "Error: This doesn't appear to be a Create React App project (react-scripts not found)"
@@ -710,8 +865,11 @@ yarn eject"""
     
     async def _get_package_manager(self) -> str:
         """Determine whether to use npm or yarn"""
-        # Check for yarn.lock
-        if os.path.exists(os.path.join(self.workspace_path, "yarn.lock")):
-            return "yarn"
-        else:
-            return "npm"
\ No newline at end of file
+        # The lockfile rarely changes within a session; clear_cache() re-checks it
+        if self._package_manager is None:
+            # Check for yarn.lock
+            if os.path.exists(os.path.join(self.workspace_path, "yarn.lock")):
+                self._package_manager = "yarn"
+            else:
+                self._package_manager = "npm"
+        return self._package_manager
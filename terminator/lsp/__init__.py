@@ -1,5 +1,7 @@
 # Language Server Protocol (LSP) Module for Terminator IDE
 
+from typing import Final
+
 from .client import LSPClient, LanguageServerManager
 from .features import (
     CompletionProvider,
@@ -10,8 +12,9 @@ from .features import (
 )
 from .integration import LSPIntegration
 
-# Default CSS for LSP UI components
-LSP_CSS = """
+# Default CSS for LSP UI components. Kept as str: apps concatenate it with the
+# other component CSS strings, and the literal is already built once at import
+LSP_CSS: Final[str] = """
 /* Hover tooltip */
 .lsp-hover {
     background: $surface;
@@ -7,13 +7,227 @@ import json
 import uuid
 import logging
 import asyncio
-import subprocess
-from typing import Dict, List, Any, Optional, Callable, Tuple, Set, Union
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Tuple, Set, Union, Awaitable
 from urllib.parse import urlparse, unquote
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    # json.loads accepts UTF-8 bytes too
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
+# Async function called with the params of a server notification
+NotificationCallback = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Header carrying the size of each LSP message body
+_CONTENT_LENGTH = b"Content-Length:"
+
+# Pre-encoded bodies of the requests sent on nearly every keystroke or cursor
+# move; only the request ID, method, URI and position are spliced in
+_COMPLETION_TEMPLATE = (
+    b'{"jsonrpc":"2.0","id":%d,"method":"textDocument/completion",'
+    b'"params":{"textDocument":{"uri":%s},"position":{"line":%d,"character":%d},'
+    b'"context":{"triggerKind":%d}}}'
+)
+_POSITION_REQUEST_TEMPLATE = (
+    b'{"jsonrpc":"2.0","id":%d,"method":"%s",'
+    b'"params":{"textDocument":{"uri":%s},"position":{"line":%d,"character":%d}}}'
+)
+
+# Capabilities advertised to every server, limited to the features this client
+# uses: each extra capability can mean larger responses or extra round trips
+_CLIENT_CAPABILITIES = {
+    "workspace": {
+        "applyEdit": True,
+        "workspaceEdit": {
+            "documentChanges": True
+        },
+        "didChangeConfiguration": {"dynamicRegistration": True},
+        "didChangeWatchedFiles": {"dynamicRegistration": True}
+    },
+    "textDocument": {
+        "synchronization": {
+            "dynamicRegistration": True
+        },
+        "completion": {
+            "dynamicRegistration": True,
+            "completionItem": {
+                "snippetSupport": True,
+                "commitCharactersSupport": True,
+                "documentationFormat": ["markdown", "plaintext"],
+                "deprecatedSupport": True,
+                "preselectSupport": True
+            },
+            "contextSupport": True
+        },
+        "hover": {
+            "dynamicRegistration": True,
+            "contentFormat": ["markdown", "plaintext"]
+        },
+        "definition": {"dynamicRegistration": True, "linkSupport": True},
+        "references": {"dynamicRegistration": True},
+        "formatting": {"dynamicRegistration": True},
+        "publishDiagnostics": {
+            "relatedInformation": True,
+            "tagSupport": {"valueSet": [1, 2]}
+        }
+    }
+}
+
+# Seconds to wait for a response, and how often pending requests are checked
+# against their deadline by a single sweeper task
+_REQUEST_TIMEOUT = 30.0
+_TIMEOUT_SWEEP_INTERVAL = 0.5
+
+# Maximum number of hover/definition/completion results kept per client
+_RESPONSE_CACHE_SIZE = 256
+
+# Quiet period (seconds) before a document change is sent; bursts of typing
+# are coalesced into a single didChange with the latest text
+_CHANGE_DEBOUNCE = 0.020
+
+# Incremental changes are only sent while the replaced region is at most this
+# fraction of the document; past that the full text is as cheap to send
+_INCREMENTAL_MAX_RATIO = 0.5
+
+# Outgoing messages are only drained once this many bytes are buffered, so a
+# burst of small notifications does not yield to the event loop each time
+_DRAIN_THRESHOLD = 65536
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix of two strings, found by binary search on slices"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of two strings, at most limit characters"""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _position_at(text: str, offset: int) -> Dict[str, int]:
+    """
+    Convert a string offset into an LSP position
+    
+    LSP counts characters in UTF-16 code units, so characters outside the
+    Basic Multilingual Plane count twice.
+    
+    Args:
+        text: Document text
+        offset: Offset into text
+        
+    Returns:
+        Position with line and character
+    """
+    line_start = text.rfind("\n", 0, offset) + 1
+    return {
+        "line": text.count("\n", 0, offset),
+        "character": len(text[line_start:offset].encode("utf-16-le")) // 2
+    }
+
+
+def _incremental_change(old: str, new: str) -> Optional[Dict[str, Any]]:
+    """
+    Describe the edit from old to new text as a single replaced range
+    
+    Args:
+        old: Text last sent to the server
+        new: Current text
+        
+    Returns:
+        A TextDocumentContentChangeEvent with a range, or None if the full
+        text should be sent instead
+    """
+    # Positions are only computed for "\n" line breaks; a lone "\r" is also a
+    # line break in LSP, so such documents are always sent in full
+    if old.count("\r") != old.count("\r\n"):
+        return None
+        
+    prefix = _common_prefix_length(old, new)
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    old_end = len(old) - suffix
+    
+    # Never split a "\r\n" pair between the kept and replaced text
+    if prefix and old[prefix - 1] == "\r":
+        prefix -= 1
+    if suffix and old[old_end] == "\n" and old_end and old[old_end - 1] == "\r":
+        suffix -= 1
+        old_end += 1
+        
+    removed = old[prefix:old_end]
+    inserted = new[prefix:len(new) - suffix]
+    if len(removed) + len(inserted) > len(new) * _INCREMENTAL_MAX_RATIO:
+        return None
+        
+    return {
+        "range": {
+            "start": _position_at(old, prefix),
+            "end": _position_at(old, old_end)
+        },
+        "rangeLength": len(removed.encode("utf-16-le")) // 2,
+        "text": inserted
+    }
+
+
+def _path_to_uri(path: str) -> str:
+    """Convert a local file path to a URI"""
+    # Relative paths depend on the working directory, so resolve them first
+    # and only cache by absolute path
+    if not os.path.isabs(path):
+        path = os.path.abspath(path)
+    return _absolute_path_to_uri(path)
+
+
+@functools.lru_cache(maxsize=512)
+def _absolute_path_to_uri(path: str) -> str:
+    """Convert an absolute local file path to a URI"""
+    return f"file://{os.path.normpath(path)}"
+
+
+@functools.lru_cache(maxsize=512)
+def _uri_to_path(uri: str) -> str:
+    """Convert a URI to a local file path"""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        raise ValueError(f"Only file:// URIs are supported, got {uri}")
+        
+    path = parsed.path
+    
+    # Handle Windows paths
+    if os.name == "nt":
+        if path.startswith("/"):
+            path = path[1:]
+        path = path.replace("/", "\\")
+        
+    return unquote(path)
+
+
 class LSPClient:
     """
     Language Server Protocol client for communicating with language servers
@@ -38,7 +252,7 @@ class LSPClient:
         self.name = name
         
         # Server process and communication
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         
@@ -46,14 +260,32 @@ class LSPClient:
         self.request_id = 0
         self.initialized = False
         self.running = False
-        self.pending_requests: Dict[int, asyncio.Future] = {}
-        self.notification_callbacks: Dict[str, List[Callable]] = {}
+        # Request ID -> (future for the response, loop.time() deadline)
+        self.pending_requests: Dict[int, Tuple[asyncio.Future[Any], float]] = {}
+        self.notification_callbacks: Dict[str, List[NotificationCallback]] = {}
+        # Notifications and requests from the server, handled in arrival order
+        self._inbox: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+        self._dispatch_task: Optional[asyncio.Task[None]] = None
+        self._timeout_sweeper: Optional[asyncio.Task[None]] = None
+        # Reader and stderr drain tasks, held until they finish so they are not
+        # collected while the loop only keeps weak references to them
+        self._io_tasks: Set[asyncio.Task[None]] = set()
         
         # Server capabilities (populated after initialization)
         self.server_capabilities: Dict[str, Any] = {}
         
-        # Tracking open documents
-        self.open_documents: Set[str] = set()
+        # Tracking open documents: URI -> current version
+        self.open_documents: Dict[str, int] = {}
+        
+        # Debounced didChange: URI -> pending send timer / latest (text, version)
+        self._pending_changes: Dict[str, asyncio.TimerHandle] = {}
+        self._latest_changes: Dict[str, Tuple[str, int]] = {}
+        self._flush_tasks: Set[asyncio.Task[None]] = set()
+        # Text last sent to the server per URI, the base for incremental changes
+        self._last_text: Dict[str, str] = {}
+        
+        # (method, uri, version, line, character, ...) -> result, in LRU order
+        self._response_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
     
     async def start(self) -> bool:
         """
@@ -65,25 +297,27 @@ class LSPClient:
         try:
             logger.info(f"Starting language server: {self.name}")
             
-            # Start the server process
-            self.process = subprocess.Popen(
-                self.server_cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=self.workspace_path,
-                env=os.environ.copy()
+            # Start the server process; its pipes are already asyncio streams
+            self.process = await asyncio.create_subprocess_exec(
+                *self.server_cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.workspace_path
             )
             
             # Set up communication streams
-            self.reader, self.writer = await asyncio.open_connection(
-                stdin=self.process.stdout,
-                stdout=self.process.stdin
-            )
+            self.reader = self.process.stdout
+            self.writer = self.process.stdin
+            assert self.process.stderr is not None
             
             # Start message processing loop
             self.running = True
-            asyncio.create_task(self._read_messages())
+            self._track_io_task(asyncio.create_task(self._read_messages()))
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+            self._timeout_sweeper = asyncio.create_task(self._sweep_timeouts())
+            # Drain stderr so a chatty server cannot block on a full pipe
+            self._track_io_task(asyncio.create_task(self._log_stderr(self.process.stderr)))
             
             # Initialize the server
             success = await self._initialize_server()
@@ -100,6 +334,11 @@ class LSPClient:
             await self.stop()
             return False
     
+    def _track_io_task(self, task: asyncio.Task[None]) -> None:
+        """Keep a reference to a stream task until it finishes"""
+        self._io_tasks.add(task)
+        task.add_done_callback(self._io_tasks.discard)
+    
     async def stop(self) -> None:
         """Stop the language server process and clean up resources"""
         if self.running:
@@ -111,32 +350,53 @@ class LSPClient:
                     await self.send_request("shutdown", {})
                     await self.send_notification("exit", {})
                 
-                # Close writer
+                # Flush anything still buffered, then close writer
                 if self.writer:
-                    self.writer.close()
-                    await self.writer.wait_closed()
+                    try:
+                        if not self.writer.is_closing():
+                            await self.writer.drain()
+                        self.writer.close()
+                        await self.writer.wait_closed()
+                    except (ConnectionError, BrokenPipeError):
+                        # The server already exited; there is nothing left to flush
+                        pass
                 
-                # Terminate process if still running
-                if self.process and self.process.poll() is None:
-                    self.process.terminate()
+                # Give the process time to exit after "exit", then kill it
+                if self.process and self.process.returncode is None:
                     try:
-                        await asyncio.wait_for(asyncio.create_subprocess_exec(
-                            *["kill", str(self.process.pid)]
-                        ), timeout=2.0)
+                        await asyncio.wait_for(self.process.wait(), timeout=2.0)
                     except asyncio.TimeoutError:
                         self.process.kill()
+                        await self.process.wait()
             
             except Exception as e:
                 logger.error(f"Error stopping language server: {str(e)}", exc_info=True)
             finally:
                 # Clean up resources
+                if self._dispatch_task:
+                    self._dispatch_task.cancel()
+                    self._dispatch_task = None
+                if self._timeout_sweeper:
+                    self._timeout_sweeper.cancel()
+                    self._timeout_sweeper = None
+                self._inbox = asyncio.Queue()
                 self.initialized = False
                 self.reader = None
                 self.writer = None
                 self.process = None
+                # Fail outstanding requests now that no response can arrive
+                for future, _ in self.pending_requests.values():
+                    if not future.done():
+                        future.set_exception(Exception("Language server stopped"))
                 self.pending_requests.clear()
                 self.notification_callbacks.clear()
                 self.open_documents.clear()
+                self._response_cache.clear()
+                for timer in self._pending_changes.values():
+                    timer.cancel()
+                self._pending_changes.clear()
+                self._latest_changes.clear()
+                self._last_text.clear()
     
     async def _initialize_server(self) -> bool:
         """
@@ -153,84 +413,13 @@ class LSPClient:
                 "version": "1.0.0"
             },
             "rootPath": self.workspace_path,
-            "rootUri": self._path_to_uri(self.workspace_path),
-            "capabilities": {
-                "workspace": {
-                    "applyEdit": True,
-                    "workspaceEdit": {
-                        "documentChanges": True,
-                        "resourceOperations": ["create", "rename", "delete"]
-                    },
-                    "didChangeConfiguration": {"dynamicRegistration": True},
-                    "didChangeWatchedFiles": {"dynamicRegistration": True},
-                    "symbol": {"dynamicRegistration": True},
-                    "executeCommand": {"dynamicRegistration": True}
-                },
-                "textDocument": {
-                    "synchronization": {
-                        "dynamicRegistration": True,
-                        "willSave": True,
-                        "willSaveWaitUntil": True,
-                        "didSave": True
-                    },
-                    "completion": {
-                        "dynamicRegistration": True,
-                        "completionItem": {
-                            "snippetSupport": True,
-                            "commitCharactersSupport": True,
-                            "documentationFormat": ["markdown", "plaintext"],
-                            "deprecatedSupport": True,
-                            "preselectSupport": True
-                        },
-                        "contextSupport": True
-                    },
-                    "hover": {
-                        "dynamicRegistration": True,
-                        "contentFormat": ["markdown", "plaintext"]
-                    },
-                    "signatureHelp": {
-                        "dynamicRegistration": True,
-                        "signatureInformation": {
-                            "documentationFormat": ["markdown", "plaintext"],
-                            "parameterInformation": {"labelOffsetSupport": True}
-                        }
-                    },
-                    "definition": {"dynamicRegistration": True, "linkSupport": True},
-                    "references": {"dynamicRegistration": True},
-                    "documentHighlight": {"dynamicRegistration": True},
-                    "documentSymbol": {
-                        "dynamicRegistration": True,
-                        "symbolKind": {"valueSet": list(range(1, 26))}
-                    },
-                    "codeAction": {
-                        "dynamicRegistration": True,
-                        "codeActionLiteralSupport": {
-                            "codeActionKind": {
-                                "valueSet": [
-                                    "quickfix",
-                                    "refactor",
-                                    "refactor.extract",
-                                    "refactor.inline",
-                                    "refactor.rewrite",
-                                    "source",
-                                    "source.organizeImports"
-                                ]
-                            }
-                        }
-                    },
-                    "formatting": {"dynamicRegistration": True},
-                    "rangeFormatting": {"dynamicRegistration": True},
-                    "rename": {"dynamicRegistration": True},
-                    "publishDiagnostics": {
-                        "relatedInformation": True,
-                        "tagSupport": {"valueSet": [1, 2]}
-                    }
-                }
-            },
-            "trace": "verbose",
+            "rootUri": _path_to_uri(self.workspace_path),
+            "capabilities": _CLIENT_CAPABILITIES,
+            # "verbose" makes servers send a $/logTrace notification per message
+            "trace": "off",
             "workspaceFolders": [
                 {
-                    "uri": self._path_to_uri(self.workspace_path),
+                    "uri": _path_to_uri(self.workspace_path),
                     "name": os.path.basename(self.workspace_path)
                 }
             ]
@@ -260,38 +449,47 @@ class LSPClient:
     
     async def _read_messages(self) -> None:
         """Read and process messages from the language server"""
-        if not self.reader:
+        reader = self.reader
+        if not reader:
             return
             
-        while self.running:
+        # Read until EOF rather than while running, so that the reply to the
+        # shutdown request sent by stop() is still delivered
+        while True:
             try:
-                # Read message headers
-                header = ""
-                while self.running:
-                    line = await self.reader.readline()
-                    if not line:
-                        # EOF reached, server has closed the connection
+                # Read all message headers at once
+                try:
+                    header = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    # EOF reached, server has closed the connection
+                    if self.running:
                         logger.warning(f"Language server {self.name} closed the connection")
-                        await self.stop()
-                        return
-                        
-                    header += line.decode("utf-8")
-                    if header.endswith("\r\n\r\n"):
-                        break
+                    # No reply can arrive any more, so don't attempt a shutdown request
+                    self.initialized = False
+                    await self.stop()
+                    return
                 
-                # Parse Content-Length
+                # Parse Content-Length without decoding the header block
                 content_length = 0
-                for header_line in header.split("\r\n"):
-                    if header_line.startswith("Content-Length:"):
-                        content_length = int(header_line.split(":", 1)[1].strip())
+                start = header.find(_CONTENT_LENGTH)
+                if start >= 0:
+                    start += len(_CONTENT_LENGTH)
+                    content_length = int(header[start:header.find(b"\r\n", start)])
                 
                 # Read message content
                 if content_length > 0:
-                    content = await self.reader.readexactly(content_length)
-                    message = json.loads(content.decode("utf-8"))
+                    content = await reader.readexactly(content_length)
+                    message = _json_loads(content)
                     
                     # Process the message
-                    asyncio.create_task(self._handle_message(message))
+                    if "method" in message:
+                        # Notifications and server requests go to the dispatch loop
+                        self._inbox.put_nowait(message)
+                    else:
+                        # Responses only resolve a pending future and never
+                        # suspend, so handle them inline without queueing them
+                        # behind slow notification callbacks
+                        await self._handle_message(message)
             
             except (asyncio.CancelledError, asyncio.IncompleteReadError):
                 # Connection closed or cancelled
@@ -300,6 +498,25 @@ class LSPClient:
                 logger.error(f"Error reading LSP message: {str(e)}", exc_info=True)
                 # Continue trying to read messages
     
+    async def _dispatch_loop(self) -> None:
+        """Handle queued server messages, draining all ready messages per wakeup"""
+        while True:
+            message = await self._inbox.get()
+            while True:
+                await self._handle_message(message)
+                try:
+                    message = self._inbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+    
+    async def _log_stderr(self, stream: asyncio.StreamReader) -> None:
+        """Forward the language server's stderr to the debug log"""
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            logger.debug(f"{self.name}: {line.decode('utf-8', errors='replace').rstrip()}")
+    
     async def _handle_message(self, message: Dict[str, Any]) -> None:
         """Handle a message from the language server"""
         try:
@@ -308,8 +525,9 @@ class LSPClient:
                 # Response to a request
                 request_id = message["id"]
                 if request_id in self.pending_requests:
-                    future = self.pending_requests.pop(request_id)
-                    future.set_result(message)
+                    future, _ = self.pending_requests.pop(request_id)
+                    if not future.done():
+                        future.set_result(message)
                 else:
                     logger.warning(f"Received response for unknown request ID: {request_id}")
             
@@ -317,8 +535,9 @@ class LSPClient:
                 # Error response
                 request_id = message["id"]
                 if request_id in self.pending_requests:
-                    future = self.pending_requests.pop(request_id)
-                    future.set_exception(Exception(f"LSP error: {message['error']}"))
+                    future, _ = self.pending_requests.pop(request_id)
+                    if not future.done():
+                        future.set_exception(Exception(f"LSP error: {message['error']}"))
                 else:
                     logger.warning(f"Received error for unknown request ID: {request_id}")
             
@@ -331,11 +550,17 @@ class LSPClient:
                 # Notification from server
                 method = message["method"]
                 if method in self.notification_callbacks:
-                    for callback in self.notification_callbacks[method]:
-                        try:
-                            await callback(message.get("params", {}))
-                        except Exception as e:
-                            logger.error(f"Error in notification callback: {str(e)}", exc_info=True)
+                    # Run the callbacks concurrently so a slow one doesn't hold up the rest
+                    params = message.get("params", {})
+                    results = await asyncio.gather(
+                        *(callback(params) for callback in self.notification_callbacks[method]),
+                        return_exceptions=True
+                    )
+                    for result in results:
+                        if isinstance(result, Exception):
+                            logger.error(
+                                f"Error in notification callback: {str(result)}", exc_info=result
+                            )
             
             else:
                 logger.warning(f"Received unknown message type: {message}")
@@ -361,9 +586,7 @@ class LSPClient:
         if not self.writer:
             raise Exception("Language server not connected")
             
-        # Generate request ID
-        self.request_id += 1
-        request_id = self.request_id
+        request_id, future = self._register_request()
         
         # Create request message
         request = {
@@ -373,16 +596,63 @@ class LSPClient:
             "params": params
         }
         
-        # Create future for the response
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-        
         # Send the request
         await self._send_message(request)
         
+        return await self._wait_for_response(request_id, future, method)
+    
+    async def _send_encoded_request(
+        self, method: str, template: bytes, *args: Any
+    ) -> Dict[str, Any]:
+        """
+        Send a request whose body is spliced into a pre-encoded JSON template
+        
+        Args:
+            method: LSP method name, used in error messages
+            template: Request body with the request ID as its first placeholder
+            *args: Values for the remaining placeholders
+            
+        Returns:
+            Server response
+            
+        Raises:
+            Exception: If there is an error sending the request or
+                      the server responds with an error
+        """
+        if not self.writer:
+            raise Exception("Language server not connected")
+            
+        request_id, future = self._register_request()
+        await self._send_raw(template % (request_id, *args))
+        
+        return await self._wait_for_response(request_id, future, method)
+    
+    def _register_request(self) -> Tuple[int, asyncio.Future[Any]]:
+        """Allocate a request ID and the future its response will complete"""
+        self.request_id += 1
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        deadline = loop.time() + _REQUEST_TIMEOUT
+        self.pending_requests[self.request_id] = (future, deadline)
+        return self.request_id, future
+    
+    async def _wait_for_response(
+        self, request_id: int, future: asyncio.Future[Any], method: str
+    ) -> Dict[str, Any]:
+        """
+        Wait for the response to a sent request
+        
+        Args:
+            request_id: ID of the request
+            future: Future completed by the response
+            method: LSP method name, used in error messages
+            
+        Returns:
+            The result of the response
+        """
         try:
-            # Wait for response with timeout
-            response = await asyncio.wait_for(future, timeout=30.0)
+            # Wait for response; _sweep_timeouts fails the future at its deadline
+            response = await future
             
             if "error" in response:
                 error_msg = response["error"].get("message", "Unknown error")
@@ -393,9 +663,21 @@ class LSPClient:
             return response.get("result", {})
             
         except asyncio.TimeoutError:
-            self.pending_requests.pop(request_id, None)
             raise Exception(f"Timeout waiting for response to {method} request")
     
+    async def _sweep_timeouts(self) -> None:
+        """Fail requests whose deadline has passed, checking periodically"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(_TIMEOUT_SWEEP_INTERVAL)
+            now = loop.time()
+            expired = [request_id for request_id, (_, deadline) in self.pending_requests.items()
+                       if deadline <= now]
+            for request_id in expired:
+                future, _ = self.pending_requests.pop(request_id)
+                if not future.done():
+                    future.set_exception(asyncio.TimeoutError())
+    
     async def send_notification(self, method: str, params: Dict[str, Any]) -> None:
         """
         Send a notification to the language server
@@ -451,6 +733,18 @@ class LSPClient:
         Args:
             message: Message to send
             
+        Raises:
+            Exception: If there is an error sending the message
+        """
+        await self._send_raw(_json_dumps(message))
+    
+    async def _send_raw(self, content: bytes) -> None:
+        """
+        Send an already encoded message body to the language server
+        
+        Args:
+            content: JSON-encoded message
+            
         Raises:
             Exception: If there is an error sending the message
         """
@@ -458,21 +752,17 @@ class LSPClient:
             raise Exception("Language server not connected")
             
         try:
-            # Encode the message
-            content = json.dumps(message).encode("utf-8")
+            # Write the message with Content-Length header in a single write
+            self.writer.write(b"Content-Length: %d\r\n\r\n" % len(content) + content)
             
-            # Write the message with Content-Length header
-            header = f"Content-Length: {len(content)}\r\n\r\n"
-            self.writer.write(header.encode("utf-8"))
-            self.writer.write(content)
-            
-            await self.writer.drain()
+            if self.writer.transport.get_write_buffer_size() > _DRAIN_THRESHOLD:
+                await self.writer.drain()
             
         except Exception as e:
             logger.error(f"Error sending LSP message: {str(e)}", exc_info=True)
             raise Exception(f"Failed to send message: {str(e)}")
     
-    def register_notification_callback(self, method: str, callback: Callable) -> None:
+    def register_notification_callback(self, method: str, callback: NotificationCallback) -> None:
         """
         Register a callback for server notifications
         
@@ -485,7 +775,9 @@ class LSPClient:
             
         self.notification_callbacks[method].append(callback)
     
-    def unregister_notification_callback(self, method: str, callback: Callable) -> None:
+    def unregister_notification_callback(
+        self, method: str, callback: NotificationCallback
+    ) -> None:
         """
         Unregister a notification callback
         
@@ -518,48 +810,87 @@ class LSPClient:
             }
         })
         
-        self.open_documents.add(uri)
+        self.open_documents[uri] = 1
+        self._last_text[uri] = text
     
     async def text_document_did_change(self, uri: str, text: str, version: int) -> None:
         """
         Notify the server that a document has changed
         
+        Changes arriving within _CHANGE_DEBOUNCE of each other are coalesced
+        into one notification carrying the latest text. Requests about the
+        document flush a pending change first, so the server never answers
+        from stale text.
+        
         Args:
             uri: Document URI
             text: New document text
             version: Document version
         """
-        # Check if we're using incremental or full sync
-        sync_kind = self.server_capabilities.get("textDocumentSync", {})
-        if isinstance(sync_kind, dict):
-            sync_kind = sync_kind.get("change", 1)  # Default to full sync
+        self.open_documents[uri] = version
+        self._invalidate_responses(uri)
         
-        if sync_kind == 2:  # Incremental sync
-            # For simplicity, we're always sending full content for now
-            # A proper implementation would calculate changes
-            await self.send_notification("textDocument/didChange", {
-                "textDocument": {
-                    "uri": uri,
-                    "version": version
-                },
-                "contentChanges": [
-                    {
-                        "text": text
-                    }
-                ]
-            })
-        else:  # Full sync
+        self._latest_changes[uri] = (text, version)
+        timer = self._pending_changes.get(uri)
+        if timer is not None:
+            timer.cancel()
+        self._pending_changes[uri] = asyncio.get_running_loop().call_later(
+            _CHANGE_DEBOUNCE, self._start_flush, uri
+        )
+    
+    def _start_flush(self, uri: str) -> None:
+        """
+        Start sending a debounced change once its timer fires
+        
+        The event loop only keeps weak references to tasks, so the task is
+        held in _flush_tasks until it finishes.
+        
+        Args:
+            uri: Document URI
+        """
+        task = asyncio.create_task(self._flush_change(uri))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _flush_change(self, uri: str) -> None:
+        """
+        Send the pending change for a document, if there is one
+        
+        Args:
+            uri: Document URI
+        """
+        timer = self._pending_changes.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+        change = self._latest_changes.pop(uri, None)
+        if change is None:
+            return
+        text, version = change
+        
+        try:
+            # Check if we're using incremental or full sync
+            sync_kind = self.server_capabilities.get("textDocumentSync", {})
+            if isinstance(sync_kind, dict):
+                sync_kind = sync_kind.get("change", 1)  # Default to full sync
+            
+            content_change = None
+            if sync_kind == 2:  # Incremental sync
+                previous = self._last_text.get(uri)
+                if previous is not None:
+                    content_change = _incremental_change(previous, text)
+            if content_change is None:  # Full sync
+                content_change = {"text": text}
+                
+            self._last_text[uri] = text
             await self.send_notification("textDocument/didChange", {
                 "textDocument": {
                     "uri": uri,
                     "version": version
                 },
-                "contentChanges": [
-                    {
-                        "text": text
-                    }
-                ]
+                "contentChanges": [content_change]
             })
+        except Exception as e:
+            logger.error(f"Error sending document change: {str(e)}", exc_info=True)
     
     async def text_document_did_close(self, uri: str) -> None:
         """
@@ -568,13 +899,16 @@ class LSPClient:
         Args:
             uri: Document URI
         """
+        await self._flush_change(uri)
         await self.send_notification("textDocument/didClose", {
             "textDocument": {
                 "uri": uri
             }
         })
         
-        self.open_documents.discard(uri)
+        self.open_documents.pop(uri, None)
+        self._last_text.pop(uri, None)
+        self._invalidate_responses(uri)
     
     async def get_completion(self, uri: str, position: Dict[str, int], 
                            trigger_kind: int = 1, 
@@ -591,20 +925,31 @@ class LSPClient:
         Returns:
             Completion items
         """
+        await self._flush_change(uri)
+        
+        key = self._response_cache_key("textDocument/completion", uri, position,
+                                       trigger_kind, trigger_character)
+        
+        if not trigger_character:
+            return await self._cached_request(key, lambda: self._send_encoded_request(
+                "textDocument/completion", _COMPLETION_TEMPLATE,
+                _json_dumps(uri), position["line"], position["character"], trigger_kind
+            ))
+            
         params = {
             "textDocument": {
                 "uri": uri
             },
             "position": position,
             "context": {
-                "triggerKind": trigger_kind
+                "triggerKind": trigger_kind,
+                "triggerCharacter": trigger_character
             }
         }
-        
-        if trigger_character:
-            params["context"]["triggerCharacter"] = trigger_character
             
-        return await self.send_request("textDocument/completion", params)
+        return await self._cached_request(
+            key, lambda: self.send_request("textDocument/completion", params)
+        )
     
     async def get_hover(self, uri: str, position: Dict[str, int]) -> Dict[str, Any]:
         """
@@ -617,14 +962,13 @@ class LSPClient:
         Returns:
             Hover information
         """
-        params = {
-            "textDocument": {
-                "uri": uri
-            },
-            "position": position
-        }
-            
-        return await self.send_request("textDocument/hover", params)
+        await self._flush_change(uri)
+        
+        key = self._response_cache_key("textDocument/hover", uri, position)
+        return await self._cached_request(key, lambda: self._send_encoded_request(
+            "textDocument/hover", _POSITION_REQUEST_TEMPLATE,
+            b"textDocument/hover", _json_dumps(uri), position["line"], position["character"]
+        ))
     
     async def get_definition(self, uri: str, position: Dict[str, int]) -> Dict[str, Any]:
         """
@@ -637,14 +981,13 @@ class LSPClient:
         Returns:
             Definition locations
         """
-        params = {
-            "textDocument": {
-                "uri": uri
-            },
-            "position": position
-        }
-            
-        return await self.send_request("textDocument/definition", params)
+        await self._flush_change(uri)
+        
+        key = self._response_cache_key("textDocument/definition", uri, position)
+        return await self._cached_request(key, lambda: self._send_encoded_request(
+            "textDocument/definition", _POSITION_REQUEST_TEMPLATE,
+            b"textDocument/definition", _json_dumps(uri), position["line"], position["character"]
+        ))
     
     async def get_references(self, uri: str, position: Dict[str, int], 
                            include_declaration: bool = True) -> Dict[str, Any]:
@@ -659,6 +1002,8 @@ class LSPClient:
         Returns:
             Reference locations
         """
+        await self._flush_change(uri)
+        
         params = {
             "textDocument": {
                 "uri": uri
@@ -681,6 +1026,8 @@ class LSPClient:
         Returns:
             Text edits to format the document
         """
+        await self._flush_change(uri)
+        
         params = {
             "textDocument": {
                 "uri": uri
@@ -693,26 +1040,60 @@ class LSPClient:
             
         return await self.send_request("textDocument/formatting", params)
     
-    def _path_to_uri(self, path: str) -> str:
-        """Convert a local file path to a URI"""
-        path = os.path.abspath(os.path.normpath(path))
-        return f"file://{path}"
-    
-    def _uri_to_path(self, uri: str) -> str:
-        """Convert a URI to a local file path"""
-        parsed = urlparse(uri)
-        if parsed.scheme != "file":
-            raise ValueError(f"Only file:// URIs are supported, got {uri}")
+    def _response_cache_key(self, method: str, uri: str, position: Dict[str, int],
+                            *extra: Any) -> Optional[Tuple[Any, ...]]:
+        """
+        Build the response cache key for a position request
+        
+        Args:
+            method: LSP method name
+            uri: Document URI
+            position: Position in the document (line, character)
+            *extra: Further request parameters that affect the result
             
-        path = parsed.path
+        Returns:
+            The cache key, or None if the document is not open (no known version)
+        """
+        version = self.open_documents.get(uri)
+        if version is None:
+            return None
+        return (method, uri, version, position["line"], position["character"], *extra)
+    
+    async def _cached_request(self, key: Optional[Tuple[Any, ...]],
+                              send: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached result for an idempotent request, or send it and cache the result
+        
+        Results are shared between callers and must not be modified.
         
-        # Handle Windows paths
-        if os.name == "nt":
-            if path.startswith("/"):
-                path = path[1:]
-            path = path.replace("/", "\\")
+        Args:
+            key: Key from _response_cache_key, or None to bypass the cache
+            send: Sends the request and returns its result
+            
+        Returns:
+            The request result
+        """
+        if key is None:
+            return await send()
+            
+        if key in self._response_cache:
+            self._response_cache.move_to_end(key)
+            return self._response_cache[key]
             
-        return unquote(path)
+        result = await send()
+        
+        # Don't cache a result for a version the document has moved past
+        if self.open_documents.get(key[1]) == key[2]:
+            self._response_cache[key] = result
+            if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return result
+    
+    def _invalidate_responses(self, uri: str) -> None:
+        """Drop cached responses for a document"""
+        stale = [key for key in self._response_cache if key[1] == uri]
+        for key in stale:
+            del self._response_cache[key]
 
 
 class LanguageServerManager:
@@ -3,13 +3,18 @@ Performance Module - Provides performance optimization utilities for Terminator
 """
 
 import time
+import random
 import logging
 import asyncio
 import functools
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union, Coroutine
+from typing import (
+    Any, Awaitable, Callable, Coroutine, Dict, List, Optional, ParamSpec, TypeVar, Union,
+    overload,
+)
 
 F = TypeVar('F', bound=Callable[..., Any])
 R = TypeVar('R')
+P = ParamSpec('P')
 
 class PerformanceOptimizer:
     """Class providing performance optimization utilities for Terminator IDE"""
@@ -218,6 +223,8 @@ class TimingProfiler:
     """Utility class for profiling function execution time"""
     
     _timing_data: Dict[str, List[float]] = {}
+    # Fraction of calls recorded for functions profiled with sampling
+    _sample_rates: Dict[str, float] = {}
     
     @staticmethod
     def profile(func: F) -> F:
@@ -252,34 +259,69 @@ class TimingProfiler:
         
         return wrapper  # type: ignore
     
+    @overload
     @staticmethod
-    def async_profile(func):
+    def async_profile(
+        func: Callable[P, Awaitable[R]], *, sample_rate: float = 1.0
+    ) -> Callable[P, Coroutine[Any, Any, R]]: ...
+
+    @overload
+    @staticmethod
+    def async_profile(
+        func: None = None, *, sample_rate: float = 1.0
+    ) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]]: ...
+
+    @staticmethod
+    def async_profile(
+        func: Optional[Callable[P, Awaitable[R]]] = None, *, sample_rate: float = 1.0
+    ) -> Union[
+        Callable[P, Coroutine[Any, Any, R]],
+        Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]],
+    ]:
         """
         Decorator to profile async function execution time
         
+        Can be applied bare (``@TimingProfiler.async_profile``) to time every call,
+        or with a sample rate (``@TimingProfiler.async_profile(sample_rate=0.01)``)
+        so that only a fraction of calls on hot paths pay the profiling cost.
+        
         Args:
             func: Async function to profile
+            sample_rate: Fraction of calls to record (0.0 - 1.0)
             
         Returns:
-            Wrapped function
+            Wrapped function, or a decorator if called without a function
         """
+        if func is None:
+            def decorator(
+                func: Callable[P, Awaitable[R]]
+            ) -> Callable[P, Coroutine[Any, Any, R]]:
+                return TimingProfiler.async_profile(func, sample_rate=sample_rate)
+            return decorator
+        
         func_key = f"{func.__module__}.{func.__qualname__}"
         
         if func_key not in TimingProfiler._timing_data:
             TimingProfiler._timing_data[func_key] = []
+        timings = TimingProfiler._timing_data[func_key]
+        if sample_rate < 1.0:
+            TimingProfiler._sample_rates[func_key] = sample_rate
         
         @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            start_time = time.time()
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            # Skip unsampled calls without touching the clock
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return await func(*args, **kwargs)
+            
+            start_time = time.perf_counter()
             result = await func(*args, **kwargs)
-            end_time = time.time()
+            execution_time = time.perf_counter() - start_time
             
             # Record the execution time
-            execution_time = end_time - start_time
-            TimingProfiler._timing_data[func_key].append(execution_time)
+            timings.append(execution_time)
             
             # Log the execution time
-            logging.debug(f"Async function {func_key} executed in {execution_time:.4f} seconds")
+            logging.debug("Async function %s executed in %.4f seconds", func_key, execution_time)
             
             return result
         
@@ -290,6 +332,9 @@ class TimingProfiler:
         """
         Get timing statistics for profiled functions
         
+        For sampled functions, count and total are estimates scaled by the
+        sample rate; samples is the number of calls actually timed.
+        
         Args:
             func_key: Optional function key to get stats for
                     If None, get stats for all functions
@@ -300,28 +345,23 @@ class TimingProfiler:
         stats = {}
         
         if func_key:
-            # Get stats for a specific function
-            if func_key in TimingProfiler._timing_data:
-                times = TimingProfiler._timing_data[func_key]
-                if times:
-                    stats[func_key] = {
-                        'count': len(times),
-                        'avg': sum(times) / len(times),
-                        'min': min(times),
-                        'max': max(times),
-                        'total': sum(times)
-                    }
+            keys = [func_key] if func_key in TimingProfiler._timing_data else []
         else:
-            # Get stats for all functions
-            for key, times in TimingProfiler._timing_data.items():
-                if times:
-                    stats[key] = {
-                        'count': len(times),
-                        'avg': sum(times) / len(times),
-                        'min': min(times),
-                        'max': max(times),
-                        'total': sum(times)
-                    }
+            keys = list(TimingProfiler._timing_data)
+            
+        for key in keys:
+            times = TimingProfiler._timing_data[key]
+            if times:
+                rate = TimingProfiler._sample_rates.get(key, 1.0)
+                total = sum(times)
+                stats[key] = {
+                    'count': round(len(times) / rate),
+                    'samples': len(times),
+                    'avg': total / len(times),
+                    'min': min(times),
+                    'max': max(times),
+                    'total': total / rate
+                }
         
         return stats
     
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path so we can import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminator.frameworks import base
+from terminator.frameworks.base import FrameworkDetector, FrameworkProvider, search_app_file
+
+
+class _Provider(FrameworkProvider):
+    """Minimal provider for exercising the shared command helpers"""
+    
+    framework_name = "Test"
+    framework_icon = "T"
+    framework_commands = []
+    
+    async def get_project_info(self):
+        return {}
+    
+    async def run_command(self, command_id):
+        return ""
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_react_detected_in_workspace_without_root_dependency(tmp_path):
+    """A root package.json that doesn't list react falls back to the sources"""
+    _write(str(tmp_path / "package.json"), json.dumps({
+        "workspaces": ["packages/*"],
+        "devDependencies": {"typescript": "^5.0.0"}
+    }))
+    _write(str(tmp_path / "packages" / "web" / "package.json"), json.dumps({
+        "dependencies": {"react": "^18.0.0"}
+    }))
+    _write(str(tmp_path / "src" / "App.jsx"), "export default function App() {}\n")
+    
+    assert FrameworkDetector(str(tmp_path)).detect_frameworks()["react"] is True
+
+
+def test_react_detected_from_peer_dependencies(tmp_path):
+    """Libraries often list react only as a peer dependency"""
+    _write(str(tmp_path / "package.json"), json.dumps({
+        "peerDependencies": {"react": ">=17"}
+    }))
+    
+    assert FrameworkDetector(str(tmp_path)).detect_frameworks()["react"] is True
+
+
+def test_react_not_detected_without_dependency_or_sources(tmp_path):
+    _write(str(tmp_path / "package.json"), json.dumps({
+        "dependencies": {"express": "^4.0.0"},
+        "keywords": ["react"]
+    }))
+    
+    assert FrameworkDetector(str(tmp_path)).detect_frameworks()["react"] is False
+
+
+def test_run_shell_command_returns_stdout_or_stderr(tmp_path):
+    provider = _Provider(str(tmp_path))
+    # Runs in the workspace and prints a byte that is not valid UTF-8
+    script = "import os, sys; print(os.getcwd(), flush=True); sys.stdout.buffer.write(b'\\xff')"
+    
+    async def run():
+        ok = await provider._run_shell_command([sys.executable, "-c", script])
+        failed = await provider._run_shell_command(
+            [sys.executable, "-c", "import sys; print('out'); sys.exit('bad')"]
+        )
+        return ok, failed
+    
+    ok, failed = asyncio.run(run())
+    assert ok.splitlines() == [os.path.realpath(str(tmp_path)), "\ufffd"]
+    assert failed == "Error (1):\nbad\n"
+
+
+def test_run_shell_command_streams_merged_output(tmp_path):
+    provider = _Provider(str(tmp_path))
+    chunks = []
+    script = "import sys; print('one', flush=True); print('two', file=sys.stderr)"
+    
+    output = asyncio.run(provider._run_shell_command([sys.executable, "-c", script], chunks.append))
+    
+    assert output == "".join(chunks)
+    assert sorted(output.splitlines()) == ["one", "two"]
+
+
+def test_run_shell_command_stops_command_on_timeout(tmp_path):
+    provider = _Provider(str(tmp_path))
+    chunks = []
+    script = "import os, time; print(os.getpid(), flush=True); time.sleep(30)"
+    
+    async def run():
+        async with asyncio.timeout(1.0):
+            await provider._run_shell_command([sys.executable, "-c", script], chunks.append)
+    
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+    
+    # The command was stopped and reaped, not left running
+    with pytest.raises(ProcessLookupError):
+        os.kill(int("".join(chunks)), 0)
+
+
+def test_search_app_file_prefers_shallow_matches(tmp_path):
+    _write(str(tmp_path / "pkg" / "app.py"), "")
+    _write(str(tmp_path / "node_modules" / "main.py"), "")
+    _write(str(tmp_path / "a" / "b" / "c" / "d" / "main.py"), "")
+    
+    assert search_app_file(str(tmp_path), ("main.py", "app.py")) == str(tmp_path / "pkg" / "app.py")
+    assert search_app_file(str(tmp_path), ("main.py",)) is None
+
+
+def _forward(data, chunk_size, split_cr=False):
+    """Forward data through _forward_stream in reads of chunk_size bytes"""
+    async def run():
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        chunks = []
+        await _Provider("")._forward_stream(stream, chunks.append, chunk_size, split_cr)
+        return chunks
+    
+    return asyncio.run(run())
+
+
+def test_forward_stream_sends_whole_lines_across_split_reads():
+    text = "héllo 😀\r\nwörld 中文\nno newline at the end"
+    
+    for chunk_size in range(1, 12):
+        chunks = _forward(text.encode("utf-8"), chunk_size)
+        
+        assert "".join(chunks) == text
+        # Only the unterminated final line may arrive without a line end
+        assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+
+
+def test_forward_stream_split_cr_forwards_progress_updates():
+    text = "10%\r50%\r\n100%\r\ndone\n"
+    
+    def lines(value):
+        return value.replace("\r\n", "\n").replace("\r", "\n")
+    
+    for chunk_size in range(1, 8):
+        chunks = _forward(text.encode("utf-8"), chunk_size, split_cr=True)
+        
+        # Each forwarded "\r" ends a line, so the "\n" of a "\r\n" split across
+        # reads must not be forwarded as an extra empty line
+        assert "".join(lines(chunk) for chunk in chunks) == lines(text)
+        assert all(chunk.endswith(("\n", "\r")) for chunk in chunks)
+
+
+def test_forward_stream_replaces_invalid_utf8():
+    assert "".join(_forward(b"ok \xff\xfe\n", 2)) == "ok ��\n"
+
+
+def test_run_shell_command_marks_omitted_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(base, "_OUTPUT_TAIL_LINES", 3)
+    provider = _Provider(str(tmp_path))
+    
+    output = asyncio.run(provider._run_shell_command(
+        [sys.executable, "-c", "for i in range(5): print(i)"]
+    ))
+    
+    assert output == "… 2 earlier lines omitted\n2\n3\n4\n"
+
+
+def test_react_command_reports_package_json_removed_after_stat(tmp_path):
+    from terminator.frameworks.react import ReactFrameworkProvider
+    
+    package_json = tmp_path / "package.json"
+    package_json.write_text(json.dumps({"dependencies": {"react-scripts": "5.0.0"}}))
+    pkg_stat = os.stat(package_json)
+    package_json.unlink()
+    provider = ReactFrameworkProvider(str(tmp_path))
+    
+    output = asyncio.run(provider._eject(pkg_stat))
+    
+    assert output == "Error: package.json not found. Is this a React project?"
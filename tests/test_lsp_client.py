@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+import random
+import sys
+
+# Add parent directory to path so we can import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminator.lsp import client as client_module
+from terminator.lsp.client import LSPClient, _incremental_change
+
+# Closes its stdin, answers the initialize request and exits without waiting
+# for shutdown, like a server that crashed or was killed
+_EXITING_SERVER = r"""
+import json, os, sys, time
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+length = 0
+while True:
+    line = stdin.readline()
+    if line == b"\r\n":
+        break
+    if line.startswith(b"Content-Length:"):
+        length = int(line.split(b":")[1])
+request = json.loads(stdin.read(length))
+os.close(0)
+time.sleep(0.1)
+body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {"capabilities": {}}})
+stdout.write(b"Content-Length: %d\r\n\r\n%s" % (len(body), body.encode()))
+stdout.flush()
+"""
+
+
+def test_stop_after_server_exit_cleans_up_without_errors(tmp_path, caplog):
+    """A server that exits on its own is reaped without logging an error"""
+    async def run():
+        client = LSPClient([sys.executable, "-c", _EXITING_SERVER], str(tmp_path), "python", "fake")
+        assert await client.start()
+        process = client.process
+        
+        # The EOF left by the exiting server makes the reader call stop()
+        for _ in range(200):
+            if client.process is None:
+                break
+            await asyncio.sleep(0.01)
+        return client, process
+    
+    with caplog.at_level(logging.ERROR, logger="terminator.lsp.client"):
+        client, process = asyncio.run(run())
+    
+    assert client.process is None
+    assert client.writer is None
+    assert process.returncode is not None
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+
+
+def _offset(text, position):
+    """Convert an LSP position (UTF-16 character units) to an offset into text"""
+    lines = text.split("\n")
+    offset = sum(len(line) + 1 for line in lines[:position["line"]])
+    line = lines[position["line"]]
+    index = units = 0
+    while units < position["character"]:
+        units += 2 if ord(line[index]) > 0xFFFF else 1
+        index += 1
+    assert units == position["character"], "position splits a surrogate pair"
+    return offset + index
+
+
+def _apply(text, change):
+    """Apply a ranged TextDocumentContentChangeEvent the way a server would"""
+    start = _offset(text, change["range"]["start"])
+    end = _offset(text, change["range"]["end"])
+    # Neither end may fall between the two characters of a "\r\n"
+    for offset in (start, end):
+        assert not (0 < offset < len(text) and text[offset - 1:offset + 1] == "\r\n")
+    removed = text[start:end]
+    assert change["rangeLength"] == len(removed.encode("utf-16-le")) // 2
+    return text[:start] + change["text"] + text[end:]
+
+
+def test_incremental_change_round_trips_random_edits():
+    rng = random.Random(1234)
+    pieces = ["a", "b", " ", "\n", "\r\n", "é", "😀", "中"]
+    applied = 0
+    
+    for _ in range(3000):
+        old = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        start = rng.randint(0, len(old))
+        end = rng.randint(start, min(len(old), start + 5))
+        inserted = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+        new = old[:start] + inserted + old[end:]
+        
+        change = _incremental_change(old, new)
+        if change is not None:
+            assert _apply(old, change) == new
+            applied += 1
+            
+    # Most small edits must be sent incrementally
+    assert applied > 1500
+
+
+def test_incremental_change_counts_utf16_units():
+    old = "x = '😀'\ny = 1\n"
+    new = "x = '😀!'\ny = 1\n"
+    
+    change = _incremental_change(old, new)
+    
+    assert change["range"] == {
+        "start": {"line": 0, "character": 7},
+        "end": {"line": 0, "character": 7}
+    }
+    assert change["text"] == "!"
+    assert _apply(old, change) == new
+
+
+def test_incremental_change_keeps_crlf_pairs_together():
+    old = "one\r\ntwo\r\n"
+    new = "one\r\n\r\ntwo\r\n"
+    
+    change = _incremental_change(old, new)
+    
+    assert _apply(old, change) == new
+
+
+def test_incremental_change_falls_back_to_full_text():
+    # A lone "\r" is a line break the position math doesn't handle
+    assert _incremental_change("a\rb\n" * 10, "a\rc\n" + "a\rb\n" * 9) is None
+    # Rewriting most of the document is cheaper to send in full
+    assert _incremental_change("short text", "entirely different") is None
+
+
+def test_sweeper_expires_only_overdue_requests(tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, "_REQUEST_TIMEOUT", 0.05)
+    monkeypatch.setattr(client_module, "_TIMEOUT_SWEEP_INTERVAL", 0.01)
+    client = LSPClient(["unused"], str(tmp_path), "python", "fake")
+    
+    async def run():
+        sweeper = asyncio.create_task(client._sweep_timeouts())
+        try:
+            answered_id, answered = client._register_request()
+            overdue_id, overdue = client._register_request()
+            
+            # A response before the deadline is delivered normally
+            await client._handle_message({"jsonrpc": "2.0", "id": answered_id, "result": {"ok": 1}})
+            assert await client._wait_for_response(answered_id, answered, "hover") == {"ok": 1}
+            
+            try:
+                await asyncio.wait_for(
+                    client._wait_for_response(overdue_id, overdue, "completion"), 1.0
+                )
+            except Exception as e:
+                return str(e)
+            return None
+        finally:
+            sweeper.cancel()
+    
+    assert asyncio.run(run()) == "Timeout waiting for response to completion request"
+    assert client.pending_requests == {}
@@ -0,0 +1,30 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the application modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminator.utils.performance import TimingProfiler
+
+
+def test_sampled_stats_are_scaled_by_sample_rate():
+    @TimingProfiler.async_profile(sample_rate=0.25)
+    async def sampled():
+        pass
+
+    async def run():
+        for _ in range(100):
+            await sampled()
+
+    # Record every fourth call
+    draws = iter([0.0, 0.5, 0.5, 0.5] * 25)
+    with patch("terminator.utils.performance.random.random", lambda: next(draws)):
+        asyncio.run(run())
+
+    key = f"{sampled.__module__}.{sampled.__qualname__}"
+    stats = TimingProfiler.get_stats(key)[key]
+    assert stats["samples"] == 25
+    assert stats["count"] == 100
+    assert abs(stats["total"] - stats["avg"] * 100) < 1e-9